@@ -1,5 +1,6 @@
-use super::client::api_call;
+use super::client::{api_call, take_string};
 use serde::{Deserialize, Serialize};
+use serde_json::Value;
 
 /// Application (OCA - One Click Application) structure
 #[derive(Clone, Debug, Serialize, Deserialize)]
@@ -21,55 +22,114 @@ pub struct Application {
     pub category: Option<String>,
 }
 
-/// Load available one-click applications from the API
+/// Build an `Application` from one `/v1/applications` item, taking ownership
+/// of its strings rather than copying them.
+fn parse_application(mut obj: serde_json::Map<String, Value>) -> Application {
+    let os_list = match obj.remove("osList") {
+        Some(Value::Array(list)) => list
+            .into_iter()
+            .filter_map(|v| match v {
+                Value::String(s) => Some(s),
+                _ => None,
+            })
+            .collect(),
+        _ => Vec::new(),
+    };
+
+    let tag = take_string(&mut obj, "tag").unwrap_or_default();
+    // Use tag as category for backward compatibility
+    let category = if !tag.is_empty() {
+        Some(tag.clone())
+    } else {
+        None
+    };
+
+    Application {
+        id: take_string(&mut obj, "id").unwrap_or_default(),
+        name: take_string(&mut obj, "name").unwrap_or_default(),
+        price: obj.get("price").and_then(|v| v.as_f64()).unwrap_or(0.0),
+        pricing_type: take_string(&mut obj, "pricingType").unwrap_or_default(),
+        is_active: obj.get("isActive").and_then(|v| v.as_bool()).unwrap_or(false),
+        logo_url: take_string(&mut obj, "logoUrl"),
+        tag,
+        is_experimental: obj.get("isExperimental").and_then(|v| v.as_bool()).unwrap_or(false),
+        description: take_string(&mut obj, "description"),
+        os_family: take_string(&mut obj, "osFamily").unwrap_or_default(),
+        os_list,
+        category,
+    }
+}
+
+/// Load available one-click applications from the API.
+/// Returns `None` if the API call fails.
 pub async fn load_applications(
     client: &reqwest::Client,
     api_base_url: &str,
     api_token: &str,
-) -> Vec<Application> {
-    let payload = api_call(client, api_base_url, api_token, "GET", "/v1/applications", None, None).await;
-    let mut applications = Vec::new();
-    
-    if payload.get("code").and_then(|c| c.as_str()) == Some("OKAY") {
-        if let Some(data) = payload.get("data").and_then(|d| d.as_object()) {
-            if let Some(arr) = data.get("applications").and_then(|a| a.as_array()) {
-                for item in arr {
-                    if let Some(obj) = item.as_object() {
-                        let os_list = if let Some(list) = obj.get("osList").and_then(|v| v.as_array()) {
-                            list.iter()
-                                .filter_map(|v| v.as_str().map(|s| s.to_string()))
-                                .collect()
-                        } else {
-                            Vec::new()
-                        };
-                        
-                        let tag = obj.get("tag").and_then(|v| v.as_str()).unwrap_or("").to_string();
-                        // Use tag as category for backward compatibility
-                        let category = if !tag.is_empty() {
-                            Some(tag.clone())
-                        } else {
-                            None
-                        };
-                        
-                        applications.push(Application {
-                            id: obj.get("id").and_then(|v| v.as_str()).unwrap_or("").to_string(),
-                            name: obj.get("name").and_then(|v| v.as_str()).unwrap_or("").to_string(),
-                            price: obj.get("price").and_then(|v| v.as_f64()).unwrap_or(0.0),
-                            pricing_type: obj.get("pricingType").and_then(|v| v.as_str()).unwrap_or("").to_string(),
-                            is_active: obj.get("isActive").and_then(|v| v.as_bool()).unwrap_or(false),
-                            logo_url: obj.get("logoUrl").and_then(|v| v.as_str()).map(|s| s.to_string()),
-                            tag,
-                            is_experimental: obj.get("isExperimental").and_then(|v| v.as_bool()).unwrap_or(false),
-                            description: obj.get("description").and_then(|v| v.as_str()).map(|s| s.to_string()),
-                            os_family: obj.get("osFamily").and_then(|v| v.as_str()).unwrap_or("").to_string(),
-                            os_list,
-                            category,
-                        });
-                    }
-                }
-            }
+) -> Option<Vec<Application>> {
+    let mut payload = api_call(client, api_base_url, api_token, "GET", "/v1/applications", None, None).await;
+    if payload.get("code").and_then(|c| c.as_str()) != Some("OKAY") {
+        return None;
+    }
+    Some(match payload.pointer_mut("/data/applications").map(Value::take) {
+        Some(Value::Array(items)) => items
+            .into_iter()
+            .filter_map(|item| match item {
+                Value::Object(obj) => Some(parse_application(obj)),
+                _ => None,
+            })
+            .collect(),
+        _ => Vec::new(),
+    })
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use serde_json::json;
+
+    fn object(value: Value) -> serde_json::Map<String, Value> {
+        match value {
+            Value::Object(obj) => obj,
+            other => panic!("expected a JSON object, got {other}"),
         }
     }
-    
-    applications
+
+    #[test]
+    fn application_fields_are_moved_out_of_the_payload() {
+        let app = parse_application(object(json!({
+            "id": "oca-1",
+            "name": "WordPress",
+            "price": 2.5,
+            "pricingType": "monthly",
+            "isActive": true,
+            "logoUrl": "https://example.com/wp.png",
+            "tag": "cms",
+            "osFamily": "ubuntu",
+            "osList": ["ubuntu-22", 7, "ubuntu-24"],
+        })));
+        assert_eq!(app.id, "oca-1");
+        assert_eq!(app.name, "WordPress");
+        assert_eq!(app.price, 2.5);
+        assert_eq!(app.pricing_type, "monthly");
+        assert!(app.is_active);
+        assert_eq!(app.logo_url.as_deref(), Some("https://example.com/wp.png"));
+        assert_eq!(app.tag, "cms");
+        assert_eq!(app.category.as_deref(), Some("cms"));
+        assert_eq!(app.os_family, "ubuntu");
+        assert_eq!(app.os_list, ["ubuntu-22", "ubuntu-24"]);
+    }
+
+    #[test]
+    fn application_missing_fields_fall_back_to_defaults() {
+        let app = parse_application(object(json!({"name": 3, "osList": "ubuntu"})));
+        assert_eq!(app.id, "");
+        assert_eq!(app.name, "");
+        assert_eq!(app.price, 0.0);
+        assert!(!app.is_active);
+        assert_eq!(app.logo_url, None);
+        assert_eq!(app.description, None);
+        assert_eq!(app.category, None);
+        assert!(app.os_list.is_empty());
+    }
 }
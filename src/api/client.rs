@@ -14,6 +14,14 @@ fn log_output(msg: String) {
     }
 }
 
+/// Move a string field out of a JSON object instead of cloning it.
+pub(super) fn take_string(obj: &mut serde_json::Map<String, Value>, key: &str) -> Option<String> {
+    match obj.remove(key) {
+        Some(Value::String(s)) => Some(s),
+        _ => None,
+    }
+}
+
 /// Core HTTP client function for making API calls.
 /// Handles authentication, request building, and error responses.
 pub async fn api_call(
@@ -25,51 +33,56 @@ pub async fn api_call(
     body: Option<Value>,
     params: Option<Vec<(String, String)>>,
 ) -> Value {
-    // --- Curl Logging ---
-    let mut url_for_log = format!("{}{}", api_base_url, endpoint);
-    if let Some(ref p) = params {
-        if !p.is_empty() {
-             let query_string = p.iter()
-                .map(|(k, v)| format!("{}={}", k, v))
-                .collect::<Vec<String>>()
-                .join("&");
-             url_for_log = format!("{}?{}", url_for_log, query_string);
+    // Building the curl line and re-serializing the response is pure overhead
+    // when logging is silenced (CLI and MCP modes), so skip it entirely.
+    let verbose = !SILENT.load(Ordering::Relaxed);
+    if verbose {
+        // --- Curl Logging ---
+        let mut url_for_log = format!("{}{}", api_base_url, endpoint);
+        if let Some(ref p) = params {
+            if !p.is_empty() {
+                 let query_string = p.iter()
+                    .map(|(k, v)| format!("{}={}", k, v))
+                    .collect::<Vec<String>>()
+                    .join("&");
+                 url_for_log = format!("{}?{}", url_for_log, query_string);
+            }
         }
-    }
 
-    let mut parts = Vec::new();
-    parts.push(Paint::new("curl").fg(yansi::Color::Green).bold().to_string());
-    parts.push(format!("-X {}", Paint::new(method).fg(yansi::Color::Yellow).bold()));
-    parts.push(format!("'{}'", Paint::new(&url_for_log).fg(yansi::Color::Cyan)));
+        let mut parts = Vec::new();
+        parts.push(Paint::new("curl").fg(yansi::Color::Green).bold().to_string());
+        parts.push(format!("-X {}", Paint::new(method).fg(yansi::Color::Yellow).bold()));
+        parts.push(format!("'{}'", Paint::new(&url_for_log).fg(yansi::Color::Cyan)));
 
-    if !api_token.is_empty() {
-        let masked_token = if api_token.len() > 8 {
-            format!("{}...", &api_token[..8])
-        } else {
-            "****".to_string()
-        };
-        parts.push(format!("{} {}", 
-            Paint::new("-H").fg(yansi::Color::Magenta), 
-            Paint::new(format!("'API-Token: {}'", masked_token)).fg(yansi::Color::Magenta)
-        ));
-    }
-    if body.is_some() {
-        parts.push(format!("{} {}", 
-            Paint::new("-H").fg(yansi::Color::Magenta), 
-            Paint::new("'Content-Type: application/json'").fg(yansi::Color::Magenta)
-        ));
-    }
+        if !api_token.is_empty() {
+            let masked_token = if api_token.len() > 8 {
+                format!("{}...", &api_token[..8])
+            } else {
+                "****".to_string()
+            };
+            parts.push(format!("{} {}", 
+                Paint::new("-H").fg(yansi::Color::Magenta), 
+                Paint::new(format!("'API-Token: {}'", masked_token)).fg(yansi::Color::Magenta)
+            ));
+        }
+        if body.is_some() {
+            parts.push(format!("{} {}", 
+                Paint::new("-H").fg(yansi::Color::Magenta), 
+                Paint::new("'Content-Type: application/json'").fg(yansi::Color::Magenta)
+            ));
+        }
 
-    if let Some(ref d) = body {
-        let json_str = serde_json::to_string_pretty(d).unwrap_or_default();
-        let escaped_json = json_str.replace("'", "'\\''");
-        parts.push(format!("{} {}", 
-            Paint::new("-d").fg(yansi::Color::Blue), 
-            Paint::new(format!("'{}'", escaped_json)).fg(yansi::Color::White)
-        ));
+        if let Some(ref d) = body {
+            let json_str = serde_json::to_string_pretty(d).unwrap_or_default();
+            let escaped_json = json_str.replace("'", "'\\''");
+            parts.push(format!("{} {}", 
+                Paint::new("-d").fg(yansi::Color::Blue), 
+                Paint::new(format!("'{}'", escaped_json)).fg(yansi::Color::White)
+            ));
+        }
+        log_output(format!("Request:\n{}", parts.join(" ")));
+        // --------------------
     }
-    log_output(format!("Request:\n{}", parts.join(" ")));
-    // --------------------
 
     let url = format!("{}{}", api_base_url, endpoint);
     let mut req = match method {
@@ -97,11 +110,13 @@ pub async fn api_call(
         Err(e) => serde_json::json!({"error": format!("Request failed: {}", e)}),
     };
 
-    // Colorize the response JSON for better readability in the terminal
-    let json_str = serde_json::to_string(&result).unwrap_or_else(|_| format!("{:?}", result));
-    // Grayed out color (dimmed/dark gray)
-    let response_str = Paint::new(json_str).rgb(100, 100, 100).to_string();
-    log_output(format!("Response:\n{}", response_str));
+    if verbose {
+        // Colorize the response JSON for better readability in the terminal
+        let json_str = serde_json::to_string(&result).unwrap_or_else(|_| format!("{:?}", result));
+        // Grayed out color (dimmed/dark gray)
+        let response_str = Paint::new(json_str).rgb(100, 100, 100).to_string();
+        log_output(format!("Response:\n{}", response_str));
+    }
 
     result
 }
@@ -1,4 +1,5 @@
 use std::collections::HashMap;
+use serde_json::Value;
 use crate::models::{InstanceView, OsItem, UserRecord};
 use crate::models::workspace_record::WorkspaceRecord;
 use super::client::api_call;
@@ -30,46 +31,59 @@ pub async fn load_instances_for_user(
     page: usize,
     per_page: usize,
 ) -> PaginatedInstances {
+    // Resolve access up front so non-owners only pay for parsing the
+    // instances they can see, and users with no access skip the API entirely.
+    // Owners see all instances; everyone else is limited to the union of
+    // their direct assignments and instances from their workspaces.
+    let allowed_ids: Option<std::collections::HashSet<String>> = if username.is_empty() {
+        None
+    } else {
+        use crate::services::get_accessible_instance_ids;
+        get_accessible_instance_ids(username, users_map, workspaces_map)
+            .map(|ids| ids.into_iter().collect())
+    };
+
     let mut all_instances_data = Vec::new();
     let mut current_bookmark: Option<String> = None;
 
-    loop {
+    // A non-owner with no accessible instances never needs the list.
+    while allowed_ids.as_ref().map_or(true, |ids| !ids.is_empty()) {
         let mut params = Vec::new();
         params.push(("limit".to_string(), "100".to_string()));
         if let Some(ref b) = current_bookmark {
             params.push(("bookmark".to_string(), b.clone()));
         }
 
-        let payload = api_call(client, api_base_url, api_token, "GET", "/v1/instances", None, Some(params)).await;
+        let mut payload = api_call(client, api_base_url, api_token, "GET", "/v1/instances", None, Some(params)).await;
         
-        if payload.get("code").and_then(|c| c.as_str()) == Some("OKAY") {
-            if let Some(data) = payload.get("data").and_then(|d| d.as_object()) {
-                let instances_arr = data.get("instances").and_then(|i| i.as_array());
-                
-                if let Some(arr) = instances_arr {
-                    if arr.is_empty() {
-                        break;
-                    }
-                    all_instances_data.extend(arr.clone());
-                }
+        if payload.get("code").and_then(|c| c.as_str()) != Some("OKAY") {
+            break;
+        }
+        match payload.get_mut("data") {
+            Some(Value::Object(data)) => {
+                // Move the page out of the payload instead of cloning it
+                let page_items = match data.remove("instances") {
+                    Some(Value::Array(arr)) => arr,
+                    _ => Vec::new(),
+                };
+                let page_len = page_items.len();
+                all_instances_data.extend(page_items);
 
                 // Check for next bookmark
                 let next_bookmark = data.get("bookmark").and_then(|v| v.as_str()).map(|s| s.to_string());
                 
                 // If no bookmark, or it's the same as the one we just used, or we got no instances, break
-                if next_bookmark.is_none() || next_bookmark == current_bookmark || instances_arr.map_or(true, |a| a.is_empty()) {
+                if next_bookmark.is_none() || next_bookmark == current_bookmark || page_len == 0 {
                     break;
                 }
                 current_bookmark = next_bookmark;
-            } else if let Some(arr) = payload.get("data").and_then(|d| d.as_array()) {
+            }
+            Some(Value::Array(arr)) => {
                 // Fallback for older API versions that might return array directly
-                all_instances_data.extend(arr.clone());
-                break;
-            } else {
+                all_instances_data.append(arr);
                 break;
             }
-        } else {
-            break;
+            _ => break,
         }
 
         // Limit to prevent infinite loops if something goes wrong
@@ -81,7 +95,13 @@ pub async fn load_instances_for_user(
     let mut all_instances = Vec::new();
     for item in all_instances_data {
         if let Some(obj) = item.as_object() {
-            let id = obj.get("id").and_then(|v| v.as_str()).unwrap_or("").to_string();
+            let id = obj.get("id").and_then(|v| v.as_str()).unwrap_or("");
+            if let Some(ids) = &allowed_ids {
+                if !ids.contains(id) {
+                    continue;
+                }
+            }
+            let id = id.to_string();
             let hostname = obj.get("hostname").and_then(|v| v.as_str()).unwrap_or("(no hostname)").to_string();
             let vcpu_count = obj.get("vcpuCount").and_then(|v| v.as_i64()).unwrap_or(0) as i32;
             let ram = obj.get("ram").and_then(|v| v.as_i64()).unwrap_or(0) as i32;
@@ -172,32 +192,12 @@ pub async fn load_instances_for_user(
         }
     }
     
-    // Filter instances based on workspace-centric access control.
-    // Owners see all instances; everyone else is limited to the union of
-    // their direct assignments and instances from their workspaces.
-    let filtered_instances = if username.is_empty() {
-        all_instances
-    } else {
-        use crate::services::get_accessible_instance_ids;
-        match get_accessible_instance_ids(username, users_map, workspaces_map) {
-            None => all_instances, // owner — unrestricted
-            Some(ids) => {
-                let id_set: std::collections::HashSet<&str> =
-                    ids.iter().map(|s| s.as_str()).collect();
-                all_instances
-                    .into_iter()
-                    .filter(|inst| id_set.contains(inst.id.as_str()))
-                    .collect()
-            }
-        }
-    };
-    
-    let total_count = filtered_instances.len();
+    let total_count = all_instances.len();
     
     // If page is 0 or per_page is 0, return all instances without pagination
     if page == 0 || per_page == 0 {
         return PaginatedInstances {
-            instances: filtered_instances,
+            instances: all_instances,
             total_count,
             current_page: 0,
             total_pages: 1,
@@ -220,7 +220,7 @@ pub async fn load_instances_for_user(
     let end_idx = (start_idx + per_page).min(total_count);
     
     let paginated_instances = if start_idx < total_count {
-        filtered_instances[start_idx..end_idx].to_vec()
+        all_instances[start_idx..end_idx].to_vec()
     } else {
         vec![]
     };
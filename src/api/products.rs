@@ -1,164 +1,251 @@
 use crate::models::{ProductView, ProductEntry, product_view::{Plan, PlanSpecification, PriceItem}};
-use super::client::api_call;
+use serde_json::{Map, Value};
+
+use super::client::{api_call, take_string};
+
+/// Read a plan specification in one pass over its keys; missing or
+/// non-numeric fields stay at zero.
+fn parse_specification(spec: &Map<String, Value>) -> PlanSpecification {
+    let mut out = PlanSpecification::default();
+    for (key, value) in spec {
+        let field = match key.as_str() {
+            "cpu" => &mut out.cpu,
+            "ram" => &mut out.ram,
+            "ramInMB" => &mut out.ram_in_mb,
+            "storage" => &mut out.storage,
+            "bandwidthInTB" => &mut out.bandwidth_in_tb,
+            _ => continue,
+        };
+        *field = value.as_f64().unwrap_or(0.0);
+    }
+    out
+}
+
+/// Build a `ProductView` from one `/v1/products` item, moving its strings out
+/// of the parsed document instead of copying them.
+fn parse_product(mut obj: Map<String, Value>) -> ProductView {
+    let id = take_string(&mut obj, "id").unwrap_or_default();
+    let region_id = take_string(&mut obj, "regionId").unwrap_or_default();
+    let plan_id = take_string(&mut obj, "planId").unwrap_or_default();
+    let is_active = obj.get("isActive").and_then(|v| v.as_bool()).unwrap_or(false);
+    let network_max_rate = obj.get("networkMaxRate").and_then(|v| v.as_f64()).unwrap_or(0.0);
+    let network_max_rate95 = obj.get("networkMaxRate95").and_then(|v| v.as_f64()).unwrap_or(0.0);
+    let discount_percent = obj.get("discountPercent").and_then(|v| v.as_i64()).unwrap_or(0) as i32;
+    let remaining_actual_stock = obj.get("remainingActualStock").and_then(|v| v.as_i64()).map(|i| i as i32);
+    let remaining_preorder_capacity = obj.get("remainingPreorderCapacity").and_then(|v| v.as_i64()).map(|i| i as i32);
+    let overall_activeness = obj.get("overallActiveness").and_then(|v| v.as_bool()).unwrap_or(false);
+    let ddos_activeness = obj.get("ddosActiveness").and_then(|v| v.as_bool());
+
+    // Parse plan
+    let plan = if let Some(Value::Object(mut p)) = obj.remove("plan") {
+        let specification = p
+            .get("specification")
+            .and_then(|v| v.as_object())
+            .map(parse_specification)
+            .unwrap_or_default();
+
+        Plan {
+            id: take_string(&mut p, "id").unwrap_or_default(),
+            plan_type: take_string(&mut p, "type"),
+            gpu_name: take_string(&mut p, "gpuName"),
+            gpu_quantity: p.get("gpuQuantity").and_then(|v| v.as_i64()).map(|i| i as i32),
+            specification,
+            is_active: p.get("isActive").and_then(|v| v.as_bool()).unwrap_or(false),
+        }
+    } else {
+        Plan {
+            id: "".to_string(),
+            plan_type: None,
+            gpu_name: None,
+            gpu_quantity: None,
+            specification: PlanSpecification::default(),
+            is_active: false,
+        }
+    };
+
+    // Parse price items
+    let price_items: Vec<PriceItem> = match obj.remove("priceItems") {
+        Some(Value::Array(items)) => items
+            .into_iter()
+            .filter_map(|item| match item {
+                Value::Object(mut pi_obj) => Some(PriceItem {
+                    id: take_string(&mut pi_obj, "id").unwrap_or_default(),
+                    name: take_string(&mut pi_obj, "name").unwrap_or_default(),
+                    hourly_price: pi_obj.get("hourlyPrice").and_then(|v| v.as_f64()).unwrap_or(0.0),
+                    monthly_price: pi_obj.get("monthlyPrice").and_then(|v| v.as_f64()).unwrap_or(0.0),
+                    hourly_price_without_discount: pi_obj.get("hourlyPriceWithoutDiscount").and_then(|v| v.as_f64()).unwrap_or(0.0),
+                    monthly_price_without_discount: pi_obj.get("monthlyPriceWithoutDiscount").and_then(|v| v.as_f64()).unwrap_or(0.0),
+                    discount_percent: pi_obj.get("discountPercent").and_then(|v| v.as_i64()).unwrap_or(0) as i32,
+                }),
+                _ => None,
+            })
+            .collect(),
+        _ => Vec::new(),
+    };
+
+    // Build display fields for templates
+    let description = "".to_string(); // Not in OpenAPI schema
+    let tags = "".to_string(); // Not in OpenAPI schema
+    
+    // f64's Display already prints whole numbers without a
+    // trailing ".0", so values are formatted in place.
+    let mut spec_entries = Vec::with_capacity(4);
+
+    let spec = &plan.specification;
+    if spec.cpu > 0.0 {
+        spec_entries.push(ProductEntry { term: "CPU".into(), value: format!("{} vCPU", spec.cpu) });
+    }
+    if spec.ram > 0.0 {
+        spec_entries.push(ProductEntry { term: "RAM".into(), value: format!("{} GB", spec.ram) });
+    }
+    if spec.storage > 0.0 {
+        spec_entries.push(ProductEntry { term: "Storage".into(), value: format!("{} GB", spec.storage) });
+    }
+    if spec.bandwidth_in_tb > 0.0 {
+        spec_entries.push(ProductEntry { term: "Bandwidth".into(), value: format!("{} TB", spec.bandwidth_in_tb) });
+    }
+
+    let mut price_entries = Vec::new();
+    for pi in &price_items {
+        if pi.monthly_price > 0.0 {
+            price_entries.push(ProductEntry { 
+                term: "Monthly".into(), 
+                value: format!("${:.2}", pi.monthly_price) 
+            });
+        }
+    }
+
+    ProductView {
+        id,
+        region_id,
+        plan_id,
+        is_active,
+        network_max_rate,
+        network_max_rate95,
+        discount_percent,
+        remaining_actual_stock,
+        remaining_preorder_capacity,
+        plan,
+        overall_activeness,
+        ddos_activeness,
+        price_items,
+        description,
+        tags,
+        spec_entries,
+        price_entries,
+    }
+}
 
 /// Load products/plans for a specific region.
-/// Returns a list of product offerings with specifications and pricing.
+/// Returns a list of product offerings with specifications and pricing, or
+/// `None` if the API call fails.
 pub async fn load_products(
     client: &reqwest::Client,
     api_base_url: &str,
     api_token: &str,
     region_id: &str,
-) -> Vec<ProductView> {
+) -> Option<Vec<ProductView>> {
     let params = vec![
         ("regionId".into(), region_id.to_string()),
         ("per_page".into(), "1000".into()),
     ];
-    let payload = api_call(client, api_base_url, api_token, "GET", "/v1/products", None, Some(params)).await;
-    let mut out = vec![];
-    
-    if payload.get("code").and_then(|c| c.as_str()) == Some("OKAY") {
-        if let Some(arr) = payload.get("data").and_then(|d| d.as_array()) {
-            for item in arr {
-                if let Some(obj) = item.as_object() {
-                    let id = obj
-                        .get("id")
-                        .and_then(|v| v.as_str())
-                        .unwrap_or_default()
-                        .to_string();
-
-                    let region_id = obj.get("regionId").and_then(|v| v.as_str()).unwrap_or("").to_string();
-                    let plan_id = obj.get("planId").and_then(|v| v.as_str()).unwrap_or("").to_string();
-                    let is_active = obj.get("isActive").and_then(|v| v.as_bool()).unwrap_or(false);
-                    let network_max_rate = obj.get("networkMaxRate").and_then(|v| v.as_f64()).unwrap_or(0.0);
-                    let network_max_rate95 = obj.get("networkMaxRate95").and_then(|v| v.as_f64()).unwrap_or(0.0);
-                    let discount_percent = obj.get("discountPercent").and_then(|v| v.as_i64()).unwrap_or(0) as i32;
-                    let remaining_actual_stock = obj.get("remainingActualStock").and_then(|v| v.as_i64()).map(|i| i as i32);
-                    let remaining_preorder_capacity = obj.get("remainingPreorderCapacity").and_then(|v| v.as_i64()).map(|i| i as i32);
-                    let overall_activeness = obj.get("overallActiveness").and_then(|v| v.as_bool()).unwrap_or(false);
-                    let ddos_activeness = obj.get("ddosActiveness").and_then(|v| v.as_bool());
-
-                    // Parse plan
-                    let plan_obj = obj.get("plan").and_then(|v| v.as_object());
-                    let plan = if let Some(p) = plan_obj {
-                        let spec_obj = p.get("specification").and_then(|v| v.as_object());
-                        let specification = if let Some(spec) = spec_obj {
-                            PlanSpecification {
-                                cpu: spec.get("cpu").and_then(|v| v.as_f64()).unwrap_or(0.0),
-                                ram: spec.get("ram").and_then(|v| v.as_f64()).unwrap_or(0.0),
-                                ram_in_mb: spec.get("ramInMB").and_then(|v| v.as_f64()).unwrap_or(0.0),
-                                storage: spec.get("storage").and_then(|v| v.as_f64()).unwrap_or(0.0),
-                                bandwidth_in_tb: spec.get("bandwidthInTB").and_then(|v| v.as_f64()).unwrap_or(0.0),
-                            }
-                        } else {
-                            PlanSpecification {
-                                cpu: 0.0,
-                                ram: 0.0,
-                                ram_in_mb: 0.0,
-                                storage: 0.0,
-                                bandwidth_in_tb: 0.0,
-                            }
-                        };
-
-                        Plan {
-                            id: p.get("id").and_then(|v| v.as_str()).unwrap_or("").to_string(),
-                            plan_type: p.get("type").and_then(|v| v.as_str()).map(|s| s.to_string()),
-                            gpu_name: p.get("gpuName").and_then(|v| v.as_str()).map(|s| s.to_string()),
-                            gpu_quantity: p.get("gpuQuantity").and_then(|v| v.as_i64()).map(|i| i as i32),
-                            specification,
-                            is_active: p.get("isActive").and_then(|v| v.as_bool()).unwrap_or(false),
-                        }
-                    } else {
-                        Plan {
-                            id: "".to_string(),
-                            plan_type: None,
-                            gpu_name: None,
-                            gpu_quantity: None,
-                            specification: PlanSpecification {
-                                cpu: 0.0,
-                                ram: 0.0,
-                                ram_in_mb: 0.0,
-                                storage: 0.0,
-                                bandwidth_in_tb: 0.0,
-                            },
-                            is_active: false,
-                        }
-                    };
-
-                    // Parse price items
-                    let price_items_arr = obj.get("priceItems").and_then(|v| v.as_array());
-                    let mut price_items = Vec::new();
-                    if let Some(items) = price_items_arr {
-                        for item in items {
-                            if let Some(pi_obj) = item.as_object() {
-                                price_items.push(PriceItem {
-                                    id: pi_obj.get("id").and_then(|v| v.as_str()).unwrap_or("").to_string(),
-                                    name: pi_obj.get("name").and_then(|v| v.as_str()).unwrap_or("").to_string(),
-                                    hourly_price: pi_obj.get("hourlyPrice").and_then(|v| v.as_f64()).unwrap_or(0.0),
-                                    monthly_price: pi_obj.get("monthlyPrice").and_then(|v| v.as_f64()).unwrap_or(0.0),
-                                    hourly_price_without_discount: pi_obj.get("hourlyPriceWithoutDiscount").and_then(|v| v.as_f64()).unwrap_or(0.0),
-                                    monthly_price_without_discount: pi_obj.get("monthlyPriceWithoutDiscount").and_then(|v| v.as_f64()).unwrap_or(0.0),
-                                    discount_percent: pi_obj.get("discountPercent").and_then(|v| v.as_i64()).unwrap_or(0) as i32,
-                                });
-                            }
-                        }
-                    }
-
-                    // Build display fields for templates
-                    let description = "".to_string(); // Not in OpenAPI schema
-                    let tags = "".to_string(); // Not in OpenAPI schema
-                    
-                    let mut spec_entries = Vec::new();
-
-                    let spec = &plan.specification;
-                    if spec.cpu > 0.0 {
-                        let val = spec.cpu.to_string();
-                        spec_entries.push(ProductEntry { term: "CPU".into(), value: format!("{} vCPU", val) });
-                    }
-                    if spec.ram > 0.0 {
-                        let val = spec.ram.to_string();
-                        spec_entries.push(ProductEntry { term: "RAM".into(), value: format!("{} GB", val) });
-                    }
-                    if spec.storage > 0.0 {
-                        let val = spec.storage.to_string();
-                        spec_entries.push(ProductEntry { term: "Storage".into(), value: format!("{} GB", val) });
-                    }
-                    if spec.bandwidth_in_tb > 0.0 {
-                        let val = spec.bandwidth_in_tb.to_string();
-                        spec_entries.push(ProductEntry { term: "Bandwidth".into(), value: format!("{} TB", val) });
-                    }
-
-                    let mut price_entries = Vec::new();
-                    for pi in &price_items {
-                        if pi.monthly_price > 0.0 {
-                            price_entries.push(ProductEntry { 
-                                term: "Monthly".into(), 
-                                value: format!("${:.2}", pi.monthly_price) 
-                            });
-                        }
-                    }
-
-                    out.push(ProductView {
-                        id,
-                        region_id,
-                        plan_id,
-                        is_active,
-                        network_max_rate,
-                        network_max_rate95,
-                        discount_percent,
-                        remaining_actual_stock,
-                        remaining_preorder_capacity,
-                        plan,
-                        overall_activeness,
-                        ddos_activeness,
-                        price_items,
-                        description,
-                        tags,
-                        spec_entries,
-                        price_entries,
-                    });
-                }
-            }
+    let mut payload = api_call(client, api_base_url, api_token, "GET", "/v1/products", None, Some(params)).await;
+    if payload.get("code").and_then(|c| c.as_str()) != Some("OKAY") {
+        return None;
+    }
+    // Consume the items one at a time so each raw product is freed as soon
+    // as its view is built, rather than holding both lists at once.
+    Some(match payload.get_mut("data").map(Value::take) {
+        Some(Value::Array(arr)) => arr
+            .into_iter()
+            .filter_map(|item| match item {
+                Value::Object(obj) => Some(parse_product(obj)),
+                _ => None,
+            })
+            .collect(),
+        _ => Vec::new(),
+    })
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use serde_json::json;
+
+    fn object(value: Value) -> Map<String, Value> {
+        match value {
+            Value::Object(obj) => obj,
+            other => panic!("expected a JSON object, got {other}"),
         }
     }
-    out
+
+    #[test]
+    fn specification_missing_or_non_numeric_fields_stay_zero() {
+        let spec = parse_specification(&object(json!({
+            "cpu": 4,
+            "ram": "8",
+            "storage": null,
+            "bandwidthInTB": 1.5,
+            "gpu": 2,
+        })));
+        assert_eq!(spec.cpu, 4.0);
+        assert_eq!(spec.ram, 0.0);
+        assert_eq!(spec.ram_in_mb, 0.0);
+        assert_eq!(spec.storage, 0.0);
+        assert_eq!(spec.bandwidth_in_tb, 1.5);
+    }
+
+    #[test]
+    fn product_strings_are_moved_out_of_the_payload() {
+        let product = parse_product(object(json!({
+            "id": "p-1",
+            "regionId": "r-1",
+            "planId": "plan-1",
+            "isActive": true,
+            "remainingActualStock": 3,
+            "plan": {
+                "id": "plan-1",
+                "type": "standard",
+                "specification": {"cpu": 2, "ram": 4, "storage": 80.5, "bandwidthInTB": 0},
+            },
+            "priceItems": [{"id": "pi-1", "name": "Base", "monthlyPrice": 12, "hourlyPrice": 0.02}, "bogus"],
+        })));
+        assert_eq!(product.id, "p-1");
+        assert_eq!(product.region_id, "r-1");
+        assert_eq!(product.plan_id, "plan-1");
+        assert!(product.is_active);
+        assert_eq!(product.remaining_actual_stock, Some(3));
+        assert_eq!(product.plan.id, "plan-1");
+        assert_eq!(product.plan.plan_type.as_deref(), Some("standard"));
+        assert_eq!(product.price_items.len(), 1);
+        assert_eq!(product.price_items[0].name, "Base");
+    }
+
+    #[test]
+    fn spec_entries_skip_zero_values_and_format_in_place() {
+        let product = parse_product(object(json!({
+            "plan": {"specification": {"cpu": 2, "ram": 4, "storage": 80.5, "bandwidthInTB": 0}},
+            "priceItems": [{"monthlyPrice": 12}],
+        })));
+        let specs: Vec<(&str, &str)> = product
+            .spec_entries
+            .iter()
+            .map(|e| (e.term.as_str(), e.value.as_str()))
+            .collect();
+        assert_eq!(specs, [("CPU", "2 vCPU"), ("RAM", "4 GB"), ("Storage", "80.5 GB")]);
+        assert_eq!(product.price_entries[0].value, "$12.00");
+    }
+
+    #[test]
+    fn product_missing_fields_fall_back_to_defaults() {
+        let product = parse_product(object(json!({"plan": "standard", "priceItems": {}})));
+        assert_eq!(product.id, "");
+        assert!(!product.is_active);
+        assert_eq!(product.remaining_actual_stock, None);
+        assert_eq!(product.plan.id, "");
+        assert_eq!(product.plan.plan_type, None);
+        assert!(product.price_items.is_empty());
+        assert!(product.spec_entries.is_empty());
+        assert!(product.price_entries.is_empty());
+    }
 }
@@ -13,12 +13,13 @@ pub struct PaginatedSshKeys {
 }
 
 /// Load SSH keys for the authenticated user (or specific customer if provided).
+/// Returns `None` if the API call fails.
 pub async fn load_ssh_keys(
     client: &reqwest::Client,
     api_base_url: &str,
     api_token: &str,
     customer_id: Option<String>,
-) -> Vec<SshKeyView> {
+) -> Option<Vec<SshKeyView>> {
     let mut params = match customer_id {
         Some(cid) => vec![("customerId".to_string(), cid)],
         None => vec![],
@@ -31,7 +32,7 @@ pub async fn load_ssh_keys(
 
     if payload.get("code").and_then(|c| c.as_str()) != Some("OKAY") {
         tracing::error!(?payload, "SSH Keys API returned error");
-        return vec![];
+        return None;
     }
 
     let data = payload.get("data").cloned().unwrap_or(Value::Null);
@@ -99,7 +100,7 @@ pub async fn load_ssh_keys(
             });
         }
     }
-    out
+    Some(out)
 }
 
 /// Load SSH keys with pagination support.
@@ -113,7 +114,7 @@ pub async fn load_ssh_keys_paginated(
     page: usize,
     per_page: usize,
 ) -> PaginatedSshKeys {
-    let all_keys = load_ssh_keys(client, api_base_url, api_token, customer_id).await;
+    let all_keys = load_ssh_keys(client, api_base_url, api_token, customer_id).await.unwrap_or_default();
     let total_count = all_keys.len();
     
     if page == 0 || per_page == 0 {
@@ -13,6 +13,25 @@ pub const DEFAULT_OWNER_ROLE: &str = "owner";
 #[allow(dead_code)]
 pub const DEFAULT_ADMIN_ROLE: &str = "admin";
 pub const DEFAULT_PBKDF2_ITERATIONS: u32 = 100_000;
+/// Minimum gap between checks of users.json for edits made outside the server.
+pub const DEFAULT_USERS_RELOAD_CHECK_INTERVAL_MS: u64 = 1000;
+/// How long slowly-changing API catalogs (OS images, regions, ...) are reused.
+pub const DEFAULT_CATALOG_CACHE_TTL_SECS: u64 = 300;
+/// How long an instance's hostname is trusted for the hostname-block check.
+pub const DEFAULT_INSTANCE_HOSTNAME_CACHE_TTL_SECS: u64 = 60;
+/// How long a customer's SSH key list is reused by the wizard.
+pub const DEFAULT_SSH_KEY_CACHE_TTL_SECS: u64 = 30;
+/// How long a region's product list is reused; kept short since it carries stock levels.
+pub const DEFAULT_PRODUCT_CACHE_TTL_SECS: u64 = 30;
+/// Idle keep-alive connections kept open per API host.
+pub const DEFAULT_HTTP_POOL_MAX_IDLE_PER_HOST: usize = 32;
+/// How long an idle pooled connection is kept before being closed.
+pub const DEFAULT_HTTP_POOL_IDLE_TIMEOUT_SECS: u64 = 90;
+/// TCP keepalive probe interval; shorter than the idle timeout so pooled
+/// connections dropped by middleboxes are detected before reuse.
+pub const DEFAULT_HTTP_TCP_KEEPALIVE_SECS: u64 = 30;
+/// Upper bound on establishing a new TCP/TLS connection to the API.
+pub const DEFAULT_HTTP_CONNECT_TIMEOUT_SECS: u64 = 3;
 
 pub fn load_env_file(env_file: Option<&str>) {
     if let Some(path) = env_file {
@@ -157,21 +157,23 @@ pub async fn update_access(
         return r.into_response();
     }
     let uname = username.to_lowercase();
+    // Normalize and dedupe before taking the users lock; blank entries are
+    // dropped before anything is allocated for them.
+    let mut normalized: Vec<String> = form
+        .instances
+        .iter()
+        .map(|s| s.trim())
+        .filter(|s| !s.is_empty())
+        .map(str::to_string)
+        .collect();
+    normalized.sort();
+    normalized.dedup();
     {
         let mut users = state.users.lock().unwrap();
         if let Some(rec) = users.get_mut(&uname) {
             if rec.role != "admin" && rec.role != "viewer" {
                 return plain_html("Target user is not an admin or viewer");
             }
-            // Normalize and dedupe
-            let mut normalized: Vec<String> = form
-                .instances
-                .iter()
-                .map(|s| s.trim().to_string())
-                .filter(|s| !s.is_empty())
-                .collect();
-            normalized.sort();
-            normalized.dedup();
             rec.assigned_instances = normalized;
         } else {
             return plain_html("Admin not found");
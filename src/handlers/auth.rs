@@ -6,7 +6,7 @@ use axum_extra::extract::cookie::{Cookie, CookieJar};
 use serde::Deserialize;
 
 use crate::models::AppState;
-use crate::services::{verify_password, random_session_id};
+use crate::services::{generate_password_hash, needs_rehash, persist_users_file, verify_password_blocking, random_session_id, reload_users_if_changed};
 use crate::templates::LoginTemplate;
 
 use super::helpers::{build_template_globals, current_username_from_jar, resolve_default_endpoint, TemplateGlobals, render_template};
@@ -46,25 +46,43 @@ pub async fn login_post(
     jar: CookieJar,
     Form(form): Form<LoginForm>,
 ) -> impl IntoResponse {
+    reload_users_if_changed(&state.users).await;
     let uname = form.username.trim().to_lowercase();
-    let users = state.users.lock().unwrap();
-    if let Some(record) = users.get(&uname) {
-        if verify_password(&record.password, &form.password) {
-            drop(users);
-            let sid = random_session_id();
-            state
-                .sessions
-                .lock()
-                .unwrap()
-                .insert(sid.clone(), uname.clone());
-            let mut cookie = Cookie::new("session_id", sid);
-            cookie.set_path("/");
-            cookie.set_http_only(true);
-            let target = resolve_default_endpoint(&state, &uname);
-            return (jar.add(cookie), Redirect::to(&target)).into_response();
+    // Copy the hash out so the users lock isn't held while PBKDF2 runs.
+    let stored = state.users.lock().unwrap().get(&uname).map(|rec| rec.password.clone());
+    let upgrade_from = stored.clone().filter(|hash| needs_rehash(hash));
+    if verify_password_blocking(stored, form.password.clone()).await {
+        if let Some(verified) = upgrade_from {
+            let password = form.password;
+            if let Ok(hash) = tokio::task::spawn_blocking(move || generate_password_hash(&password)).await {
+                // Only replace the hash that was just verified, so a password
+                // reset that landed in the meantime is not overwritten.
+                let replaced = match state.users.lock().unwrap().get_mut(&uname) {
+                    Some(rec) if rec.password == verified => {
+                        rec.password = hash;
+                        true
+                    }
+                    _ => false,
+                };
+                if replaced {
+                    if let Err(e) = persist_users_file(&state.users).await {
+                        tracing::error!(%e, "Failed to persist upgraded password hash");
+                    }
+                }
+            }
         }
+        let sid = random_session_id();
+        state
+            .sessions
+            .lock()
+            .unwrap()
+            .insert(sid.clone(), uname.clone());
+        let mut cookie = Cookie::new("session_id", sid);
+        cookie.set_path("/");
+        cookie.set_http_only(true);
+        let target = resolve_default_endpoint(&state, &uname);
+        return (jar.add(cookie), Redirect::to(&target)).into_response();
     }
-    drop(users);
     let TemplateGlobals {
         current_user,
         api_hostname,
@@ -4,6 +4,7 @@ use axum::{
 };
 use axum_extra::extract::cookie::CookieJar;
 use serde::Deserialize;
+use std::collections::HashSet;
 
 use crate::models::AppState;
 use crate::templates::ClockedInstancesTemplate;
@@ -19,6 +20,16 @@ pub struct UpdateClockedInstancesForm {
     pub instance_ids: String,
 }
 
+/// Split a pasted list of instance IDs on commas and newlines in a single
+/// pass; only the kept IDs are allocated.
+fn parse_instance_ids(raw: &str) -> HashSet<String> {
+    raw.split([',', '\n', '\r'])
+        .map(str::trim)
+        .filter(|s| !s.is_empty())
+        .map(str::to_owned)
+        .collect()
+}
+
 pub async fn clocked_instances_get(
     State(state): State<AppState>,
     jar: CookieJar,
@@ -56,22 +67,14 @@ pub async fn clocked_instances_post(
     if let Some(r) = ensure_owner(&state, &jar) {
         return r.into_response();
     }
-    let new_ids: std::collections::HashSet<String> = form
-        .instance_ids
-        .split([',', '\n', '\r'])
-        .map(|s| s.trim().to_string())
-        .filter(|s| !s.is_empty())
-        .collect();
-
-    {
-        let mut set = state.disabled_instances.lock().unwrap();
-        *set = new_ids.clone();
-    }
+    let new_ids = parse_instance_ids(&form.instance_ids);
 
     if let Err(e) = persist_clocked_instances_file(&new_ids).await {
         tracing::error!(%e, "Failed to persist clocked instances");
     }
 
+    *state.disabled_instances.lock().unwrap() = new_ids;
+
     if let Some(sid) = jar.get("session_id") {
         let mut flashes = state.flash_store.lock().unwrap();
         let entry = flashes.entry(sid.value().to_string()).or_default();
@@ -80,3 +83,20 @@ pub async fn clocked_instances_post(
 
     Redirect::to("/clocked-instances").into_response()
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn instance_ids_split_on_commas_and_newlines() {
+        let ids = parse_instance_ids(" a1 ,b2\r\n\nc3,,a1\n  ");
+        assert_eq!(ids, HashSet::from(["a1".to_string(), "b2".to_string(), "c3".to_string()]));
+    }
+
+    #[test]
+    fn blank_input_yields_no_ids() {
+        assert!(parse_instance_ids("").is_empty());
+        assert!(parse_instance_ids(" , \n ").is_empty());
+    }
+}
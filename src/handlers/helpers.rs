@@ -1,15 +1,15 @@
 use axum::response::{Html, IntoResponse, Redirect, Response};
-use axum::http::StatusCode;
+use axum::http::{header, HeaderMap, StatusCode};
 use axum_extra::extract::cookie::CookieJar;
 use serde::Deserialize;
 use serde_json::Value;
 
 use crate::api::{
     api_call, load_ssh_keys, load_ssh_keys_paginated, load_regions, load_products, 
-    load_instances_for_user, PaginatedInstances, PaginatedSshKeys
+    load_os_list, load_applications, load_instances_for_user, Application, PaginatedInstances, PaginatedSshKeys
 };
-use crate::models::{AppState, CurrentUser, SshKeyView, Region, ProductView, InstanceView};
-use std::collections::HashMap;
+use crate::models::{AppState, CurrentUser, SshKeyView, RegionCatalog, ProductCatalog, InstanceView, OsCatalog};
+use std::sync::Arc;
 
 #[derive(Deserialize, Debug)]
 #[serde(untagged)]
@@ -97,14 +97,6 @@ pub fn ensure_owner(state: &AppState, jar: &CookieJar) -> Option<Redirect> {
     Some(Redirect::to("/"))
 }
 
-pub async fn load_active_regions(state: &AppState) -> Vec<Region> {
-    let (regions, _) = load_regions(&state.client, &state.api_base_url, &state.api_token).await;
-    regions
-        .into_iter()
-        .filter(|region| region.is_active && !region.is_hidden)
-        .collect()
-}
-
 #[allow(dead_code)]
 pub fn ensure_logged_in(state: &AppState, jar: &CookieJar) -> Option<Redirect> {
     if current_username_from_jar(state, jar).is_none() {
@@ -138,6 +130,33 @@ pub fn render_template<T: askama::Template>(_state: &AppState, _jar: &CookieJar,
     }
 }
 
+/// Like `render_template`, but tags the page with an ETag derived from the
+/// rendered body and answers `304 Not Modified` when the browser already has it.
+/// Used on pages that mostly show slowly-changing catalog data.
+pub fn render_template_with_etag<T: askama::Template>(_state: &AppState, _jar: &CookieJar, headers: &HeaderMap, t: T) -> Response {
+    let body = match t.render() {
+        Ok(body) => body,
+        Err(e) => {
+            tracing::error!(%e, "Template render error");
+            return (StatusCode::INTERNAL_SERVER_ERROR, "Internal Server Error").into_response();
+        }
+    };
+    let etag = crate::utils::etag_for(body.as_bytes());
+    // Pages are per-user, so only the browser may keep them, and it must revalidate.
+    let cache_headers = [
+        (header::ETAG, etag.clone()),
+        (header::CACHE_CONTROL, "private, no-cache".to_string()),
+    ];
+    let not_modified = headers
+        .get(header::IF_NONE_MATCH)
+        .and_then(|v| v.to_str().ok())
+        .map_or(false, |v| crate::utils::etag_matches(v, &etag));
+    if not_modified {
+        return (StatusCode::NOT_MODIFIED, cache_headers).into_response();
+    }
+    (cache_headers, Html(body)).into_response()
+}
+
 static LOGGING_IGNORE_ENDPOINTS: &[&str] = &["/v1/os", "/v1/products"];
 
 pub async fn api_call_wrapper(
@@ -223,8 +242,17 @@ pub async fn fetch_default_customer_id(state: &AppState) -> Option<String> {
     None
 }
 
-pub async fn load_ssh_keys_api(state: &AppState, customer_id: Option<String>) -> Vec<SshKeyView> {
-    load_ssh_keys(&state.client, &state.api_base_url, &state.api_token, customer_id).await
+/// Load the SSH keys for `customer_id`, reusing the cached list while it is fresh.
+/// Failed API calls are not cached; an empty key list is.
+/// Callers that create or delete keys must clear `state.ssh_keys_cache`.
+pub async fn load_ssh_keys_api(state: &AppState, customer_id: Option<String>) -> Arc<Vec<SshKeyView>> {
+    if let Some(keys) = state.ssh_keys_cache.get(&customer_id) {
+        return keys;
+    }
+    let Some(keys) = load_ssh_keys(&state.client, &state.api_base_url, &state.api_token, customer_id.clone()).await else {
+        return Arc::new(Vec::new());
+    };
+    state.ssh_keys_cache.insert(customer_id, keys)
 }
 
 pub async fn load_ssh_keys_paginated_wrapper(
@@ -236,12 +264,51 @@ pub async fn load_ssh_keys_paginated_wrapper(
     load_ssh_keys_paginated(&state.client, &state.api_base_url, &state.api_token, customer_id, page, per_page).await
 }
 
-pub async fn load_regions_wrapper(state: &AppState) -> (Vec<Region>, HashMap<String, Region>) {
-    load_regions(&state.client, &state.api_base_url, &state.api_token).await
+/// Load the region catalog, reusing the cached copy while it is fresh.
+/// Failed API calls are not cached so the next request retries.
+pub async fn load_region_catalog(state: &AppState) -> Arc<RegionCatalog> {
+    if let Some(catalog) = state.region_catalog_cache.get(&()) {
+        return catalog;
+    }
+    let Some(regions) = load_regions(&state.client, &state.api_base_url, &state.api_token).await else {
+        return Arc::new(RegionCatalog::default());
+    };
+    state.region_catalog_cache.insert((), RegionCatalog::new(regions))
+}
+
+/// Load the products offered in `region_id`, reusing the cached catalog while it is fresh,
+/// so stepping back and forth through the wizard doesn't refetch the catalog.
+pub async fn load_product_catalog(state: &AppState, region_id: &str) -> Arc<ProductCatalog> {
+    if let Some(catalog) = state.products_cache.get(region_id) {
+        return catalog;
+    }
+    let Some(products) = load_products(&state.client, &state.api_base_url, &state.api_token, region_id).await else {
+        return Arc::new(ProductCatalog::default());
+    };
+    state.products_cache.insert(region_id.to_string(), ProductCatalog::new(products))
 }
 
-pub async fn load_products_wrapper(state: &AppState, region_id: &str) -> Vec<ProductView> {
-    load_products(&state.client, &state.api_base_url, &state.api_token, region_id).await
+/// Load the OS catalog, reusing the cached copy while it is fresh.
+/// Failed API calls are not cached so the next request retries.
+pub async fn load_os_catalog(state: &AppState) -> Arc<OsCatalog> {
+    if let Some(catalog) = state.os_catalog_cache.get(&()) {
+        return catalog;
+    }
+    let Some(items) = load_os_list(&state.client, &state.api_base_url, &state.api_token).await else {
+        return Arc::new(OsCatalog::default());
+    };
+    state.os_catalog_cache.insert((), OsCatalog::new(items))
+}
+
+/// Load the one-click application catalog, reusing the cached copy while it is fresh.
+pub async fn load_applications_cached(state: &AppState) -> Arc<Vec<Application>> {
+    if let Some(applications) = state.applications_cache.get(&()) {
+        return applications;
+    }
+    let Some(applications) = load_applications(&state.client, &state.api_base_url, &state.api_token).await else {
+        return Arc::new(Vec::new());
+    };
+    state.applications_cache.insert((), applications)
 }
 
 #[allow(dead_code)]
@@ -1,6 +1,6 @@
 use axum::{
     extract::{State, Path, Form, Query},
-    response::{IntoResponse, Redirect},
+    response::{IntoResponse, Redirect, Response},
 };
 use axum_extra::extract::cookie::CookieJar;
 use serde::Deserialize;
@@ -16,13 +16,22 @@ use crate::templates::{
 use crate::handlers::helpers::{
     build_template_globals, current_username_from_jar,
     render_template, api_call_wrapper, TemplateGlobals,
-    load_regions_wrapper, load_products_wrapper,
+    load_region_catalog, load_product_catalog, load_os_catalog,
     load_instances_for_user_paginated,
 };
-use crate::api::load_os_list;
-use crate::services::instance_service::{enforce_instance_access, simple_instance_action};
+use crate::services::instance_service::{enforce_instance_access, simple_instance_action, remember_instance_hostname};
 use crate::services::persist_users_file;
 
+/// Redirect to an instance page: `""` for the detail page, or a sub-page
+/// such as `"/resize"`. Builds the path in one allocation.
+fn redirect_to_instance(instance_id: &str, subpage: &str) -> Response {
+    let mut path = String::with_capacity("/instance/".len() + instance_id.len() + subpage.len());
+    path.push_str("/instance/");
+    path.push_str(instance_id);
+    path.push_str(subpage);
+    Redirect::to(&path).into_response()
+}
+
 #[derive(Deserialize)]
 pub struct PaginationParams {
     #[serde(default = "default_page")]
@@ -83,6 +92,7 @@ pub async fn instance_detail(
                 .and_then(|v| v.as_str())
                 .unwrap_or("(no hostname)")
                 .to_string();
+            remember_instance_hostname(&state, &instance_id, &hostname);
             details.push(("Hostname".into(), hostname.clone()));
             status = data
                 .get("status")
@@ -109,10 +119,9 @@ pub async fn instance_detail(
                 .map(|s| s.to_string());
             if let Some(pid) = product_id.clone() {
                 let product_name = if !region.is_empty() && !pid.is_empty() {
-                    let products = load_products_wrapper(&state, &region).await;
+                    let products = load_product_catalog(&state, &region).await;
                     products
-                        .into_iter()
-                        .find(|p| p.id == pid)
+                        .get(&pid)
                         .map(|p| p.id.clone())
                         .unwrap_or(pid.clone())
                 } else {
@@ -183,10 +192,10 @@ pub async fn instance_poweron_post(
             let entry = flashes.entry(sid.value().to_string()).or_default();
             entry.push(reason.message());
         }
-        return Redirect::to(&format!("/instance/{}", instance_id)).into_response();
+        return redirect_to_instance(&instance_id, "");
     }
     let _ = simple_instance_action(&state, "poweron", &instance_id).await;
-    Redirect::to(&format!("/instance/{}", instance_id)).into_response()
+    redirect_to_instance(&instance_id, "")
 }
 
 pub async fn instance_poweroff_post(
@@ -203,10 +212,10 @@ pub async fn instance_poweroff_post(
             let entry = flashes.entry(sid.value().to_string()).or_default();
             entry.push(reason.message());
         }
-        return Redirect::to(&format!("/instance/{}", instance_id)).into_response();
+        return redirect_to_instance(&instance_id, "");
     }
     let _ = simple_instance_action(&state, "poweroff", &instance_id).await;
-    Redirect::to(&format!("/instance/{}", instance_id)).into_response()
+    redirect_to_instance(&instance_id, "")
 }
 
 pub async fn instance_reset_post(
@@ -223,10 +232,10 @@ pub async fn instance_reset_post(
             let entry = flashes.entry(sid.value().to_string()).or_default();
             entry.push(reason.message());
         }
-        return Redirect::to(&format!("/instance/{}", instance_id)).into_response();
+        return redirect_to_instance(&instance_id, "");
     }
     let _ = simple_instance_action(&state, "reset", &instance_id).await;
-    Redirect::to(&format!("/instance/{}", instance_id)).into_response()
+    redirect_to_instance(&instance_id, "")
 }
 
 pub async fn instance_change_pass_get(
@@ -243,6 +252,7 @@ pub async fn instance_change_pass_get(
     if let Some(obj) = payload.as_object() {
         if let Some(data) = obj.get("data").and_then(|d| d.as_object()) {
             instance.hostname = data.get("hostname").and_then(|v| v.as_str()).unwrap_or(&instance.hostname).to_string();
+            remember_instance_hostname(&state, &instance_id, &instance.hostname);
             instance.region = data.get("region").and_then(|v| v.as_str()).unwrap_or("").to_string();
             instance.main_ip = data.get("mainIp").and_then(|v| v.as_str()).map(|s| s.to_string());
             instance.main_ipv6 = data.get("mainIpv6").and_then(|v| v.as_str()).map(|s| s.to_string());
@@ -270,7 +280,7 @@ pub async fn instance_change_pass_post(
             let entry = flashes.entry(sid.value().to_string()).or_default();
             entry.push(reason.message());
         }
-        return Redirect::to(&format!("/instance/{}/change-pass", instance_id)).into_response();
+        return redirect_to_instance(&instance_id, "/change-pass");
     }
     let endpoint = format!("/v1/instances/{}/change-pass", instance_id);
     let payload = api_call_wrapper(&state, "POST", &endpoint, None, None).await;
@@ -281,6 +291,7 @@ pub async fn instance_change_pass_post(
     if let Some(obj) = payload2.as_object() {
         if let Some(data) = obj.get("data").and_then(|d| d.as_object()) {
             instance.hostname = data.get("hostname").and_then(|v| v.as_str()).unwrap_or(&instance.hostname).to_string();
+            remember_instance_hostname(&state, &instance_id, &instance.hostname);
             instance.region = data.get("region").and_then(|v| v.as_str()).unwrap_or("").to_string();
             instance.main_ip = data.get("mainIp").and_then(|v| v.as_str()).map(|s| s.to_string());
             instance.main_ipv6 = data.get("mainIpv6").and_then(|v| v.as_str()).map(|s| s.to_string());
@@ -308,7 +319,7 @@ pub async fn instance_delete(
             let entry = flashes.entry(sid.value().to_string()).or_default();
             entry.push(reason.message());
         }
-        return Redirect::to(&format!("/instance/{}", instance_id)).into_response();
+        return redirect_to_instance(&instance_id, "");
     }
     let endpoint = format!("/v1/instances/{}", instance_id);
     let payload = api_call_wrapper(&state, "DELETE", &endpoint, None, None).await;
@@ -338,14 +349,14 @@ pub async fn instance_delete(
         } else {
             let detail = payload.get("detail").and_then(|d| d.as_str()).unwrap_or("Unknown error");
             entry.push(format!("Delete failed: {}", detail));
-            return Redirect::to(&format!("/instance/{}", instance_id)).into_response();
+            return redirect_to_instance(&instance_id, "");
         }
     }
     
     if success {
         Redirect::to("/instances").into_response()
     } else {
-        Redirect::to(&format!("/instance/{}", instance_id)).into_response()
+        redirect_to_instance(&instance_id, "")
     }
 }
 
@@ -358,22 +369,31 @@ pub async fn instance_add_traffic(
     if !enforce_instance_access(&state, current_username_from_jar(&state, &jar).as_deref(), &instance_id).await {
         return Redirect::to("/instances").into_response();
     }
+    // Reject malformed amounts before the block check can cost an upstream
+    // lookup. `parse::<f64>` also accepts "inf"/"NaN", which are not amounts.
+    let amount = match form.traffic_amount.trim().parse::<f64>() {
+        Ok(amount) if amount.is_finite() && amount > 0.0 => amount,
+        _ => {
+            if let Some(sid) = jar.get("session_id") {
+                let mut flashes = state.flash_store.lock().unwrap();
+                let entry = flashes.entry(sid.value().to_string()).or_default();
+                entry.push("Traffic amount must be a positive number.".into());
+            }
+            return redirect_to_instance(&instance_id, "");
+        }
+    };
     if let Some(reason) = crate::services::instance_service::check_instance_block(&state, &instance_id, None).await {
         if let Some(sid) = jar.get("session_id") {
             let mut flashes = state.flash_store.lock().unwrap();
             let entry = flashes.entry(sid.value().to_string()).or_default();
             entry.push(reason.message());
         }
-        return Redirect::to(&format!("/instance/{}", instance_id)).into_response();
-    }
-    if let Ok(amount) = form.traffic_amount.parse::<f64>() {
-        if amount > 0.0 {
-            let endpoint = format!("/v1/instances/{}/add-traffic", instance_id);
-            let payload = serde_json::json!({"amount": amount});
-            let _ = api_call_wrapper(&state, "POST", &endpoint, Some(payload), None).await;
-        }
+        return redirect_to_instance(&instance_id, "");
     }
-    Redirect::to(&format!("/instance/{}", instance_id)).into_response()
+    let endpoint = format!("/v1/instances/{}/add-traffic", instance_id);
+    let payload = serde_json::json!({"amount": amount});
+    let _ = api_call_wrapper(&state, "POST", &endpoint, Some(payload), None).await;
+    redirect_to_instance(&instance_id, "")
 }
 
 pub async fn instance_resize_get(
@@ -385,11 +405,16 @@ pub async fn instance_resize_get(
         return Redirect::to("/instances").into_response();
     }
     let endpoint = format!("/v1/instances/{}", instance_id);
-    let payload = api_call_wrapper(&state, "GET", &endpoint, None, None).await;
+    // The instance and the region list are independent; fetch them concurrently.
+    let (payload, region_catalog) = tokio::join!(
+        api_call_wrapper(&state, "GET", &endpoint, None, None),
+        load_region_catalog(&state),
+    );
     let mut instance = InstanceView::new_with_defaults(instance_id.clone());
     if let Some(obj) = payload.as_object() {
         if let Some(data) = obj.get("data").and_then(|d| d.as_object()) {
             instance.hostname = data.get("hostname").and_then(|v| v.as_str()).unwrap_or(&instance.hostname).to_string();
+            remember_instance_hostname(&state, &instance_id, &instance.hostname);
             instance.region = data.get("region").and_then(|v| v.as_str()).unwrap_or("").to_string();
             instance.main_ip = data.get("mainIp").and_then(|v| v.as_str()).map(|s| s.to_string());
             instance.main_ipv6 = data.get("mainIpv6").and_then(|v| v.as_str()).map(|s| s.to_string());
@@ -397,11 +422,36 @@ pub async fn instance_resize_get(
             instance.status_display = crate::utils::format_status(&instance.status);
         }
     }
-    let (regions, _map) = load_regions_wrapper(&state).await;
     let TemplateGlobals { current_user, api_hostname, base_url, flash_messages, has_flash_messages } = build_template_globals(&state, &jar);
     let disabled_by_env = state.is_instance_disabled(&instance_id);
     let disabled_by_host = state.is_hostname_blocked(&instance.hostname);
-    render_template(&state, &jar, ResizeTemplate { current_user, api_hostname, base_url, flash_messages, has_flash_messages, instance, regions: &regions, disabled_by_env, disabled_by_host })
+    render_template(&state, &jar, ResizeTemplate { current_user, api_hostname, base_url, flash_messages, has_flash_messages, instance, regions: &region_catalog.regions, disabled_by_env, disabled_by_host })
+}
+
+/// Build the resize `extraResource` from the form's resource fields. CUSTOM
+/// sends cpu, ramInGB, diskInGB and bandwidthInTB; FIXED only the positive
+/// disk/bandwidth add-ons. Fields that don't parse as integers are left out.
+fn resize_extra_resource(form: &ResizeForm) -> serde_json::Map<String, Value> {
+    let resize_type = form.r#type.to_uppercase();
+    let is_fixed = resize_type == "FIXED";
+    let resource_fields = [
+        ("cpu", &form.cpu),
+        ("ramInGB", &form.ram_in_gb),
+        ("diskInGB", &form.disk_in_gb),
+        ("bandwidthInTB", &form.bandwidth_in_tb),
+    ];
+    let fields: &[(&str, &Option<String>)] = match resize_type.as_str() {
+        "FIXED" => &resource_fields[2..],
+        "CUSTOM" => &resource_fields,
+        _ => &[],
+    };
+    fields
+        .iter()
+        .filter_map(|(key, raw)| {
+            let n = raw.as_deref()?.parse::<i64>().ok()?;
+            (!is_fixed || n > 0).then(|| (key.to_string(), Value::from(n)))
+        })
+        .collect()
 }
 
 pub async fn instance_resize_post(
@@ -419,10 +469,11 @@ pub async fn instance_resize_post(
             let entry = flashes.entry(sid.value().to_string()).or_default();
             entry.push(reason.message());
         }
-        return Redirect::to(&format!("/instance/{}/resize", instance_id)).into_response();
+        return redirect_to_instance(&instance_id, "/resize");
     }
     let endpoint = format!("/v1/instances/{}/resize", instance_id);
     let mut payload = serde_json::json!({"type": form.r#type});
+    let extra_resource = resize_extra_resource(&form);
 
     if let Some(pid) = form.product_id {
         if !pid.trim().is_empty() {
@@ -436,49 +487,6 @@ pub async fn instance_resize_post(
         }
     }
 
-    // Build extraResource based on resize type
-    let mut extra_resource = serde_json::Map::new();
-    
-    if form.r#type.to_uppercase() == "FIXED" {
-        // For FIXED resize: only diskInGB and bandwidthInTB are allowed
-        if let Some(disk) = form.disk_in_gb {
-            if let Ok(n) = disk.parse::<i64>() {
-                if n > 0 {
-                    extra_resource.insert("diskInGB".into(), Value::from(n));
-                }
-            }
-        }
-        if let Some(bw) = form.bandwidth_in_tb {
-            if let Ok(n) = bw.parse::<i64>() {
-                if n > 0 {
-                    extra_resource.insert("bandwidthInTB".into(), Value::from(n));
-                }
-            }
-        }
-    } else if form.r#type.to_uppercase() == "CUSTOM" {
-        // For CUSTOM resize: cpu, ramInGB, diskInGB, and bandwidthInTB are required
-        if let Some(cpu) = form.cpu {
-            if let Ok(n) = cpu.parse::<i64>() {
-                extra_resource.insert("cpu".into(), Value::from(n));
-            }
-        }
-        if let Some(ram) = form.ram_in_gb {
-            if let Ok(n) = ram.parse::<i64>() {
-                extra_resource.insert("ramInGB".into(), Value::from(n));
-            }
-        }
-        if let Some(disk) = form.disk_in_gb {
-            if let Ok(n) = disk.parse::<i64>() {
-                extra_resource.insert("diskInGB".into(), Value::from(n));
-            }
-        }
-        if let Some(bw) = form.bandwidth_in_tb {
-            if let Ok(n) = bw.parse::<i64>() {
-                extra_resource.insert("bandwidthInTB".into(), Value::from(n));
-            }
-        }
-    }
-    
     if !extra_resource.is_empty() {
         payload["extraResource"] = Value::Object(extra_resource);
     }
@@ -495,7 +503,7 @@ pub async fn instance_resize_post(
         }
     }
 
-    Redirect::to(&format!("/instance/{}", instance_id)).into_response()
+    redirect_to_instance(&instance_id, "")
 }
 
 #[derive(Deserialize)]
@@ -517,6 +525,7 @@ pub async fn instance_change_os_get(
     if let Some(obj) = payload.as_object() {
         if let Some(data) = obj.get("data").and_then(|d| d.as_object()) {
             instance.hostname = data.get("hostname").and_then(|v| v.as_str()).unwrap_or(&instance.hostname).to_string();
+            remember_instance_hostname(&state, &instance_id, &instance.hostname);
             instance.vcpu_count = data.get("vcpuCount").and_then(|v| v.as_i64()).unwrap_or(0) as i32;
             instance.ram = data.get("ram").and_then(|v| v.as_i64()).unwrap_or(0) as i32;
             instance.disk = data.get("disk").and_then(|v| v.as_i64()).unwrap_or(0) as i32;
@@ -539,7 +548,7 @@ pub async fn instance_change_os_get(
         }
     }
     
-    let os_list = load_os_list(&state.client, &state.api_base_url, &state.api_token).await;
+    let os_catalog = load_os_catalog(&state).await;
     let TemplateGlobals { current_user, api_hostname, base_url, flash_messages, has_flash_messages } = build_template_globals(&state, &jar);
     let disabled_by_env = state.is_instance_disabled(&instance_id);
     let disabled_by_host = state.is_hostname_blocked(&instance.hostname);
@@ -550,7 +559,7 @@ pub async fn instance_change_os_get(
         flash_messages, 
         has_flash_messages, 
         instance, 
-        os_list, 
+        os_list: &os_catalog.items, 
         disabled_by_env, 
         disabled_by_host 
     })
@@ -571,7 +580,7 @@ pub async fn instance_change_os_post(
             let entry = flashes.entry(sid.value().to_string()).or_default();
             entry.push(reason.message());
         }
-        return Redirect::to(&format!("/instance/{}/change-os", instance_id)).into_response();
+        return redirect_to_instance(&instance_id, "/change-os");
     }
     
     let endpoint = format!("/v1/instances/{}/change-os", instance_id);
@@ -589,5 +598,74 @@ pub async fn instance_change_os_post(
         }
     }
     
-    Redirect::to(&format!("/instance/{}", instance_id)).into_response()
+    redirect_to_instance(&instance_id, "")
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use crate::handlers::helpers::take_flash_messages;
+
+    /// Post an add-traffic form for the clocked instance `i-1` and return the
+    /// flash messages it queued.
+    async fn add_traffic_to_clocked_instance(amount: &str) -> Vec<String> {
+        let state = AppState::for_tests();
+        state.disabled_instances.lock().unwrap().insert("i-1".to_string());
+        let jar = state.sign_in("alice", "owner");
+        let form = AddTrafficForm { traffic_amount: amount.to_string() };
+        let _ = instance_add_traffic(State(state.clone()), jar.clone(), Path("i-1".to_string()), Form(form)).await;
+        take_flash_messages(&state, &jar)
+    }
+
+    #[tokio::test]
+    async fn add_traffic_rejects_invalid_amounts_before_the_block_check() {
+        for amount in ["", "abc", "0", "-5", "inf", "NaN"] {
+            assert_eq!(
+                add_traffic_to_clocked_instance(amount).await,
+                ["Traffic amount must be a positive number."],
+                "{amount:?}",
+            );
+        }
+    }
+
+    #[tokio::test]
+    async fn add_traffic_runs_the_block_check_for_valid_amounts() {
+        assert_eq!(
+            add_traffic_to_clocked_instance(" 10 ").await,
+            ["Actions are disabled for this instance."],
+        );
+    }
+
+    fn resize_form(resize_type: &str, values: [Option<&str>; 4]) -> ResizeForm {
+        let [cpu, ram_in_gb, disk_in_gb, bandwidth_in_tb] = values.map(|v| v.map(str::to_string));
+        ResizeForm {
+            r#type: resize_type.to_string(),
+            product_id: None,
+            region_id: None,
+            cpu,
+            ram_in_gb,
+            disk_in_gb,
+            bandwidth_in_tb,
+        }
+    }
+
+    #[test]
+    fn custom_resize_sends_every_parsed_field() {
+        let form = resize_form("custom", [Some("4"), Some("8"), Some("0"), Some("x")]);
+        let extra = Value::Object(resize_extra_resource(&form));
+        assert_eq!(extra, serde_json::json!({"cpu": 4, "ramInGB": 8, "diskInGB": 0}));
+    }
+
+    #[test]
+    fn fixed_resize_sends_only_positive_add_ons() {
+        let form = resize_form("FIXED", [Some("4"), Some("8"), Some("20"), Some("0")]);
+        let extra = Value::Object(resize_extra_resource(&form));
+        assert_eq!(extra, serde_json::json!({"diskInGB": 20}));
+    }
+
+    #[test]
+    fn other_resize_types_send_nothing() {
+        let form = resize_form("product", [Some("4"), Some("8"), Some("20"), Some("1")]);
+        assert!(resize_extra_resource(&form).is_empty());
+    }
 }
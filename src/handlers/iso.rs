@@ -7,7 +7,7 @@ use serde::Deserialize;
 
 use crate::models::AppState;
 use crate::handlers::helpers::{
-    build_template_globals, render_template, TemplateGlobals, ensure_owner, load_active_regions,
+    build_template_globals, render_template, TemplateGlobals, ensure_owner, load_region_catalog,
 };
 use crate::api::{load_isos, download_iso};
 
@@ -53,7 +53,7 @@ pub async fn isos_list_get(
         q.per_page,
     )
     .await;
-    let regions = load_active_regions(&state).await;
+    let region_catalog = load_region_catalog(&state).await;
     
     let TemplateGlobals { current_user, api_hostname, base_url, flash_messages, has_flash_messages } = 
         build_template_globals(&state, &jar);
@@ -68,7 +68,7 @@ pub async fn isos_list_get(
             flash_messages,
             has_flash_messages,
             isos: &paginated.isos,
-            regions: &regions,
+            regions: &region_catalog.active,
             total_count: paginated.total_count,
         },
     )
@@ -6,6 +6,7 @@ use axum::{
 use axum_extra::extract::cookie::CookieJar;
 
 use crate::models::AppState;
+use crate::services::reload_users_if_changed;
 use crate::handlers::helpers::current_username_from_jar;
 
 pub async fn auth_middleware(
@@ -14,6 +15,7 @@ pub async fn auth_middleware(
     request: Request,
     next: Next,
 ) -> Response {
+    reload_users_if_changed(&state.users).await;
     if current_username_from_jar(&state, &jar).is_some() {
         next.run(request).await
     } else {
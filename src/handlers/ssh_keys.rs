@@ -104,6 +104,7 @@ pub async fn ssh_keys_post(
                 }
             }
         }
+        state.ssh_keys_cache.clear();
         return Redirect::to("/ssh-keys").into_response();
     }
     let name = form.name.clone().unwrap_or_default().trim().to_string();
@@ -128,6 +129,7 @@ pub async fn ssh_keys_post(
             }
         }
     }
+    state.ssh_keys_cache.clear();
     Redirect::to("/ssh-keys").into_response()
 }
 
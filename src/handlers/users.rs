@@ -4,6 +4,7 @@ use axum::{
 };
 use axum_extra::extract::cookie::CookieJar;
 use serde::Deserialize;
+use std::collections::HashMap;
 
 use crate::models::{AppState, UserRecord, UserRow};
 use crate::services::{generate_password_hash, persist_users_file};
@@ -11,6 +12,11 @@ use crate::templates::{UsersTemplate, UserDetailTemplate};
 
 use super::helpers::{build_template_globals, ensure_owner, plain_html, TemplateGlobals, render_template};
 
+/// Whether any owner other than `uname` exists; stops at the first one found.
+fn has_other_owner(users: &HashMap<String, UserRecord>, uname: &str) -> bool {
+    users.iter().any(|(name, r)| r.role == "owner" && name != uname)
+}
+
 pub async fn users_list(State(state): State<AppState>, jar: CookieJar) -> impl IntoResponse {
     if let Some(r) = ensure_owner(&state, &jar) {
         return r.into_response();
@@ -208,11 +214,7 @@ pub async fn update_role(
             None => return plain_html("User not found"),
         };
         if current_role == "owner" && form.role != "owner" {
-            let remaining_owners = users
-                .iter()
-                .filter(|(n, r)| r.role == "owner" && n.as_str() != uname)
-                .count();
-            if remaining_owners == 0 {
+            if !has_other_owner(&users, &uname) {
                 return plain_html("At least one owner required");
             }
         }
@@ -280,11 +282,7 @@ pub async fn delete_user(
         }
         if let Some(rec) = users.get(&uname) {
             if rec.role == "owner" {
-                let owners = users
-                    .iter()
-                    .filter(|(name, r)| r.role == "owner" && name.as_str() != uname)
-                    .count();
-                if owners == 0 {
+                if !has_other_owner(&users, &uname) {
                     return plain_html("At least one owner required");
                 }
             }
@@ -1,24 +1,25 @@
 use axum::{
     extract::State,
-    response::{IntoResponse, Redirect},
+    http::HeaderMap,
+    response::{IntoResponse, Redirect, Response},
 };
 use axum_extra::extract::cookie::CookieJar;
 use serde_json::Value;
-use std::collections::{HashMap, HashSet};
+use std::collections::HashMap;
 
 use crate::models::{
     AppState, Step1FormData, Step2FormData,
-    CustomPlanFormValues, Region, ProductView, ProductEntry, OsItem,
-    SshKeyDisplay, Extras, PlanState,
+    CustomPlanFormValues, ProductEntry,
+    SshKeyDisplay, Extras, PlanState, BaseState,
 };
 use crate::services::{parse_wizard_base, build_base_query_pairs};
-use crate::utils::{build_query_string, parse_urlencoded_body};
-use crate::api::{load_regions, load_products, load_os_list, load_applications};
+use crate::utils::{parse_urlencoded_body, url_with_query};
 use crate::templates::*;
 use crate::handlers::helpers::{
     build_template_globals, absolute_url_from_state,
-    ensure_admin_or_owner, TemplateGlobals, OneOrMany, render_template,
-    api_call_wrapper, fetch_default_customer_id, load_ssh_keys_api,
+    ensure_admin_or_owner, TemplateGlobals, OneOrMany, render_template, render_template_with_etag,
+    api_call_wrapper, fetch_default_customer_id, load_ssh_keys_api, load_os_catalog,
+    load_region_catalog, load_applications_cached, load_product_catalog,
 };
 
 fn value_to_short_string(value: &Value) -> String {
@@ -42,16 +43,53 @@ fn value_to_short_string(value: &Value) -> String {
     }
 }
 
-async fn load_regions_wrapper(state: &AppState) -> (Vec<Region>, HashMap<String, Region>) {
-    load_regions(&state.client, &state.api_base_url, &state.api_token).await
+/// Send the user back to step 1 when the wizard state lacks hostnames or a region.
+fn ensure_wizard_base(base: &BaseState) -> Option<Redirect> {
+    if base.hostnames.is_empty() || base.region.is_empty() {
+        return Some(Redirect::to("/create/step-1"));
+    }
+    None
 }
 
-async fn load_products_wrapper(state: &AppState, region_id: &str) -> Vec<ProductView> {
-    load_products(&state.client, &state.api_base_url, &state.api_token, region_id).await
+/// Read a plan field trimmed once up front, so validation, the payload and the
+/// summary can use it as-is. Missing fields fall back to `default`.
+fn trimmed_field(source: &HashMap<String, String>, key: &str, default: &str) -> String {
+    source.get(key).map_or(default, |v| v.trim()).to_string()
 }
 
-async fn load_os_list_wrapper(state: &AppState) -> Vec<OsItem> {
-    load_os_list(&state.client, &state.api_base_url, &state.api_token).await
+/// Read only the plan-specific fields of the selected plan type from the query
+/// and append them to `pairs`. The other plan type's fields are left at their
+/// defaults since the templates never render them.
+fn plan_fields_from_query(
+    base: &BaseState,
+    q: &HashMap<String, String>,
+    product_id: &str,
+    pairs: &mut Vec<(String, String)>,
+) -> (Extras, CustomPlanFormValues) {
+    if base.plan_type == "fixed" {
+        let extras = Extras {
+            extra_disk: trimmed_field(q, "extra_disk", "0"),
+            extra_bandwidth: trimmed_field(q, "extra_bandwidth", "0"),
+        };
+        if !product_id.is_empty() {
+            pairs.push(("product_id".into(), product_id.to_string()));
+        }
+        pairs.push(("extra_disk".into(), extras.extra_disk.clone()));
+        pairs.push(("extra_bandwidth".into(), extras.extra_bandwidth.clone()));
+        (extras, CustomPlanFormValues::default())
+    } else {
+        let custom_plan = CustomPlanFormValues {
+            cpu: trimmed_field(q, "cpu", "2"),
+            ram_in_gb: trimmed_field(q, "ramInGB", "4"),
+            disk_in_gb: trimmed_field(q, "diskInGB", "50"),
+            bandwidth_in_tb: trimmed_field(q, "bandwidthInTB", "1"),
+        };
+        pairs.push(("cpu".into(), custom_plan.cpu.clone()));
+        pairs.push(("ramInGB".into(), custom_plan.ram_in_gb.clone()));
+        pairs.push(("diskInGB".into(), custom_plan.disk_in_gb.clone()));
+        pairs.push(("bandwidthInTB".into(), custom_plan.bandwidth_in_tb.clone()));
+        (Extras::default(), custom_plan)
+    }
 }
 
 // These functions are used by wizard steps but defined elsewhere in main.rs
@@ -63,17 +101,16 @@ async fn load_os_list_wrapper(state: &AppState) -> Vec<OsItem> {
 pub async fn create_step_1(
     State(state): State<AppState>,
     jar: CookieJar,
+    headers: HeaderMap,
     axum::extract::Query(q): axum::extract::Query<HashMap<String, String>>,
 ) -> impl IntoResponse {
     if let Some(r) = ensure_admin_or_owner(&state, &jar) {
         return r.into_response();
     }
     let base = parse_wizard_base(&q);
-    let (all_regions, _lookup) = load_regions_wrapper(&state).await;
-    // Filter to only show active, non-hidden regions
-    let regions: Vec<Region> = all_regions.into_iter()
-        .filter(|r| r.is_active && !r.is_hidden)
-        .collect();
+    let region_catalog = load_region_catalog(&state).await;
+    // Only active, non-hidden regions are offered
+    let regions = &region_catalog.active;
     let mut region_sel = base.region.clone();
     if region_sel.is_empty() && !regions.is_empty() {
         region_sel = regions[0].id.clone();
@@ -90,13 +127,13 @@ pub async fn create_step_1(
         instance_class: base.instance_class.clone(),
         plan_type: base.plan_type.clone(),
     };
-    render_template(&state, &jar, Step1Template {
+    render_template_with_etag(&state, &jar, &headers, Step1Template {
             current_user,
             api_hostname,
             base_url,
             flash_messages,
             has_flash_messages,
-            regions: &regions,
+            regions,
             form_data,
         },
     )
@@ -112,25 +149,12 @@ pub async fn create_step_2(
     if let Some(r) = ensure_admin_or_owner(&state, &jar) {
         return r.into_response();
     }
-    let mut base = parse_wizard_base(&q);
+    let base = parse_wizard_base(&q);
     if base.region.is_empty() {
         return Redirect::to("/create/step-1").into_response();
     }
-    // If hostnames passed as comma separated in textarea update parsing
-    if let Some(raw_hosts) = q.get("hostnames") {
-        base.hostnames = raw_hosts
-            .split(',')
-            .map(|s| s.trim().to_string())
-            .filter(|s| !s.is_empty())
-            .collect();
-    }
     let back_pairs = build_base_query_pairs(&base);
-    let back_q = build_query_string(&back_pairs);
-    let back_url = if back_q.is_empty() {
-        absolute_url_from_state(&state, "/create/step-1")
-    } else {
-        absolute_url_from_state(&state, &format!("/create/step-1?{}", back_q))
-    };
+    let back_url = absolute_url_from_state(&state, &url_with_query("/create/step-1", &back_pairs));
     let hostnames_text = base.hostnames.join(", ");
     let TemplateGlobals {
         current_user,
@@ -170,22 +194,27 @@ pub async fn create_step_3(
         return r.into_response();
     }
     let base = parse_wizard_base(&q);
-    if base.hostnames.is_empty() || base.region.is_empty() {
-        return Redirect::to("/create/step-1").into_response();
+    if let Some(r) = ensure_wizard_base(&base) {
+        return r.into_response();
     }
     let back_pairs = build_base_query_pairs(&base);
-    let back_q = build_query_string(&back_pairs);
-    let back_url = if back_q.is_empty() {
-        absolute_url_from_state(&state, "/create/step-2")
-    } else {
-        absolute_url_from_state(&state, &format!("/create/step-2?{}", back_q))
-    };
+    let back_url = absolute_url_from_state(&state, &url_with_query("/create/step-2", &back_pairs));
     // Build the hostnames CSV and prepare ssh key CSV for the template where needed
     let hostnames_csv = base.hostnames.join(",");
-    let ssh_key_ids_csv = base.ssh_key_ids.iter().map(|id| id.to_string()).collect::<Vec<_>>().join(",");
+    let ssh_key_ids_csv = base.ssh_key_ids_str.join(",");
+
+    // Warm the OS and application catalogs that step 5 needs while the user
+    // is still choosing a plan. Only spawn when one of them is cold, so warm
+    // caches and repeat visits add no task and no upstream calls.
+    if state.os_catalog_cache.get(&()).is_none() || state.applications_cache.get(&()).is_none() {
+        let warm_state = state.clone();
+        tokio::spawn(async move {
+            tokio::join!(load_os_catalog(&warm_state), load_applications_cached(&warm_state));
+        });
+    }
 
     if base.plan_type == "fixed" {
-        let products = load_products_wrapper(&state, &base.region).await;
+        let products = load_product_catalog(&state, &base.region).await;
         let selected_product_id = q.get("product_id").cloned().unwrap_or_default();
         let TemplateGlobals {
             current_user,
@@ -202,8 +231,8 @@ pub async fn create_step_3(
                 flash_messages,
                 has_flash_messages,
                 base_state: &base,
-                products: &products,
-                has_products: !products.is_empty(),
+                products: &products.items,
+                has_products: !products.items.is_empty(),
                 selected_product_id,
                 region_name: base.region.clone(),
                 floating_ip_count: base.floating_ip_count.to_string(),
@@ -215,14 +244,6 @@ pub async fn create_step_3(
             },
         );
     }
-    let cpu = q.get("cpu").cloned().unwrap_or_else(|| "2".into());
-    let ram = q.get("ramInGB").cloned().unwrap_or_else(|| "4".into());
-    let disk = q.get("diskInGB").cloned().unwrap_or_else(|| "50".into());
-    let bw = q
-        .get("bandwidthInTB")
-        .cloned()
-        .unwrap_or_else(|| "1".into());
-    
     let hostnames_csv = base.hostnames.join(",");
     let TemplateGlobals {
         current_user,
@@ -232,10 +253,10 @@ pub async fn create_step_3(
         has_flash_messages,
     } = build_template_globals(&state, &jar);
     let form_values = CustomPlanFormValues {
-        cpu,
-        ram_in_gb: ram,
-        disk_in_gb: disk,
-        bandwidth_in_tb: bw,
+        cpu: trimmed_field(&q, "cpu", "2"),
+        ram_in_gb: trimmed_field(&q, "ramInGB", "4"),
+        disk_in_gb: trimmed_field(&q, "diskInGB", "50"),
+        bandwidth_in_tb: trimmed_field(&q, "bandwidthInTB", "1"),
     };
     render_template(&state, &jar, Step3CustomTemplate {
             current_user,
@@ -269,32 +290,22 @@ pub async fn create_step_4(
         return r.into_response();
     }
     let base = parse_wizard_base(&q);
-    if base.hostnames.is_empty() || base.region.is_empty() {
-        return Redirect::to("/create/step-1").into_response();
+    if let Some(r) = ensure_wizard_base(&base) {
+        return r.into_response();
     }
-    let ssh_key_ids_csv = base.ssh_key_ids.iter().map(|id| id.to_string()).collect::<Vec<_>>().join(",");
-    let hostnames_csv = base.hostnames.join(",");
-    let back_pairs = build_base_query_pairs(&base);
-    let back_q = build_query_string(&back_pairs);
-    let back_url = if back_q.is_empty() {
-        absolute_url_from_state(&state, "/create/step-3")
-    } else {
-        absolute_url_from_state(&state, &format!("/create/step-3?{}", back_q))
-    };
+    // The base pairs are shared by the skip-ahead redirect and the back link;
+    // each path encodes them only once it knows it needs them.
+    let base_pairs = build_base_query_pairs(&base);
     if base.plan_type != "fixed" {
-        let next_pairs = build_base_query_pairs(&base);
-        let next_q = build_query_string(&next_pairs);
-        let next_url = if next_q.is_empty() {
-            "/create/step-5".to_string()
-        } else {
-            format!("/create/step-5?{}", next_q)
-        };
-        return Redirect::to(&next_url).into_response();
+        return Redirect::to(&url_with_query("/create/step-5", &base_pairs)).into_response();
     }
     let product_id = q.get("product_id").cloned().unwrap_or_default();
     if product_id.is_empty() {
         return Redirect::to("/create/step-3").into_response();
     }
+    let ssh_key_ids_csv = base.ssh_key_ids_str.join(",");
+    let hostnames_csv = base.hostnames.join(",");
+    let back_url = absolute_url_from_state(&state, &url_with_query("/create/step-3", &base_pairs));
     let TemplateGlobals {
         current_user,
         api_hostname,
@@ -332,14 +343,15 @@ pub async fn create_step_4(
 pub async fn create_step_5(
     State(state): State<AppState>,
     jar: CookieJar,
+    headers: HeaderMap,
     axum::extract::Query(q): axum::extract::Query<HashMap<String, String>>,
 ) -> impl IntoResponse {
     if let Some(r) = ensure_admin_or_owner(&state, &jar) {
         return r.into_response();
     }
     let base = parse_wizard_base(&q);
-    if base.hostnames.is_empty() || base.region.is_empty() {
-        return Redirect::to("/create/step-1").into_response();
+    if let Some(r) = ensure_wizard_base(&base) {
+        return r.into_response();
     }
     let TemplateGlobals {
         current_user,
@@ -352,72 +364,40 @@ pub async fn create_step_5(
     if base.plan_type == "fixed" && product_id.is_empty() {
         return Redirect::to("/create/step-3").into_response();
     }
-    let extra_disk = q.get("extra_disk").cloned().unwrap_or_else(|| "0".into());
-    let extra_bandwidth = q
-        .get("extra_bandwidth")
-        .cloned()
-        .unwrap_or_else(|| "0".into());
-    let custom_plan = CustomPlanFormValues {
-        cpu: q.get("cpu").cloned().unwrap_or_else(|| "2".into()),
-        ram_in_gb: q.get("ramInGB").cloned().unwrap_or_else(|| "4".into()),
-        disk_in_gb: q.get("diskInGB").cloned().unwrap_or_else(|| "50".into()),
-        bandwidth_in_tb: q
-            .get("bandwidthInTB")
-            .cloned()
-            .unwrap_or_else(|| "1".into()),
-    };
-    let os_list = load_os_list_wrapper(&state).await;
-    let applications = load_applications(&state.client, &state.api_base_url, &state.api_token).await;
+    let (os_catalog, applications) =
+        tokio::join!(load_os_catalog(&state), load_applications_cached(&state));
     let mut selected_os_id = base.os_id.clone();
     if selected_os_id.is_empty() {
         selected_os_id = q.get("os_id").cloned().unwrap_or_default();
     }
     if selected_os_id.is_empty() {
-        selected_os_id = os_list
-            .iter()
-            .find(|o| o.is_default)
-            .map(|o| o.id.clone())
-            .or_else(|| os_list.first().map(|o| o.id.clone()))
-            .unwrap_or_default();
+        selected_os_id = os_catalog.default_id.clone().unwrap_or_default();
     }
     let selected_app_id = base.app_id.clone().or_else(|| q.get("app_id").cloned()).unwrap_or_default();
     let mut back_pairs = build_base_query_pairs(&base);
+    let (extras, custom_plan) = plan_fields_from_query(&base, &q, &product_id, &mut back_pairs);
     let back_target = if base.plan_type == "fixed" {
-        if !product_id.is_empty() {
-            back_pairs.push(("product_id".into(), product_id.clone()));
-        }
-        back_pairs.push(("extra_disk".into(), extra_disk.clone()));
-        back_pairs.push(("extra_bandwidth".into(), extra_bandwidth.clone()));
         "/create/step-4"
     } else {
-        back_pairs.push(("cpu".into(), custom_plan.cpu.clone()));
-        back_pairs.push(("ramInGB".into(), custom_plan.ram_in_gb.clone()));
-        back_pairs.push(("diskInGB".into(), custom_plan.disk_in_gb.clone()));
-        back_pairs.push(("bandwidthInTB".into(), custom_plan.bandwidth_in_tb.clone()));
         "/create/step-3"
     };
-    let back_q = build_query_string(&back_pairs);
-    let back_url = if back_q.is_empty() {
-        absolute_url_from_state(&state, back_target)
-    } else {
-        absolute_url_from_state(&state, &format!("{}?{}", back_target, back_q))
-    };
+    let back_url = absolute_url_from_state(&state, &url_with_query(back_target, &back_pairs));
     let hostnames_csv = base.hostnames.join(",");
-    let ssh_key_ids_csv = base.ssh_key_ids.iter().map(|id| id.to_string()).collect::<Vec<_>>().join(",");
-    render_template(&state, &jar, Step5Template {
+    let ssh_key_ids_csv = base.ssh_key_ids_str.join(",");
+    render_template_with_etag(&state, &jar, &headers, Step5Template {
             current_user,
             api_hostname,
             base_url,
             flash_messages,
             has_flash_messages,
             base_state: &base,
-            os_list: &os_list,
+            os_list: &os_catalog.items,
             selected_os_id,
             applications: &applications,
             selected_app_id,
             product_id,
-            extra_disk,
-            extra_bandwidth,
+            extra_disk: extras.extra_disk,
+            extra_bandwidth: extras.extra_bandwidth,
             custom_plan,
             floating_ip_count: base.floating_ip_count.to_string(),
             back_url,
@@ -439,8 +419,8 @@ pub async fn create_step_6(
         return r.into_response();
     }
     let base = parse_wizard_base(&q);
-    if base.hostnames.is_empty() || base.region.is_empty() {
-        return Redirect::to("/create/step-1").into_response();
+    if let Some(r) = ensure_wizard_base(&base) {
+        return r.into_response();
     }
     if base.os_id.is_empty() {
         return Redirect::to("/create/step-5").into_response();
@@ -456,58 +436,23 @@ pub async fn create_step_6(
     if base.plan_type == "fixed" && product_id.is_empty() {
         return Redirect::to("/create/step-3").into_response();
     }
-    let extra_disk = q.get("extra_disk").cloned().unwrap_or_else(|| "0".into());
-    let extra_bandwidth = q
-        .get("extra_bandwidth")
-        .cloned()
-        .unwrap_or_else(|| "0".into());
-    let custom_plan = CustomPlanFormValues {
-        cpu: q.get("cpu").cloned().unwrap_or_else(|| "2".into()),
-        ram_in_gb: q.get("ramInGB").cloned().unwrap_or_else(|| "4".into()),
-        disk_in_gb: q.get("diskInGB").cloned().unwrap_or_else(|| "50".into()),
-        bandwidth_in_tb: q
-            .get("bandwidthInTB")
-            .cloned()
-            .unwrap_or_else(|| "1".into()),
-    };
     let mut back_pairs = build_base_query_pairs(&base);
-    let back_target = if base.plan_type == "fixed" {
-        if !product_id.is_empty() {
-            back_pairs.push(("product_id".into(), product_id.clone()));
-        }
-        back_pairs.push(("extra_disk".into(), extra_disk.clone()));
-        back_pairs.push(("extra_bandwidth".into(), extra_bandwidth.clone()));
-        "/create/step-5"
-    } else {
-        back_pairs.push(("cpu".into(), custom_plan.cpu.clone()));
-        back_pairs.push(("ramInGB".into(), custom_plan.ram_in_gb.clone()));
-        back_pairs.push(("diskInGB".into(), custom_plan.disk_in_gb.clone()));
-        back_pairs.push(("bandwidthInTB".into(), custom_plan.bandwidth_in_tb.clone()));
-        "/create/step-5"
-    };
-    let back_q = build_query_string(&back_pairs);
-    let back_url = if back_q.is_empty() {
-        absolute_url_from_state(&state, back_target)
-    } else {
-        absolute_url_from_state(&state, &format!("{}?{}", back_target, back_q))
-    };
+    let (extras, custom_plan) = plan_fields_from_query(&base, &q, &product_id, &mut back_pairs);
+    let back_url = absolute_url_from_state(&state, &url_with_query("/create/step-5", &back_pairs));
     let customer_id = fetch_default_customer_id(&state).await;
     let ssh_keys = load_ssh_keys_api(&state, customer_id).await;
-    let selected_ids: HashSet<String> =
-        base.ssh_key_ids.iter().map(|id| id.to_string()).collect();
+    // Only a handful of keys are ever selected, so scan the list directly
+    // rather than hashing it into a set.
+    let selected_ids = &base.ssh_key_ids_str;
     let selectable: Vec<SshKeyDisplay> = ssh_keys
-        .into_iter()
-        .map(|key| {
-            let is_selected = selected_ids.contains(&key.id);
-            SshKeyDisplay {
-                id: key.id,
-                name: key.name,
-                selected: is_selected,
-            }
+        .iter()
+        .map(|key| SshKeyDisplay {
+            id: key.id.clone(),
+            name: key.name.clone(),
+            selected: selected_ids.contains(&key.id),
         })
         .collect();
     let hostnames_csv = base.hostnames.join(",");
-    let _ssh_key_ids_csv = base.ssh_key_ids.iter().map(|id| id.to_string()).collect::<Vec<_>>().join(",");
     render_template(&state, &jar, Step6Template {
             current_user,
             api_hostname,
@@ -518,8 +463,8 @@ pub async fn create_step_6(
             floating_ip_count: base.floating_ip_count.to_string(),
             ssh_keys: &selectable,
             product_id,
-            extra_disk,
-            extra_bandwidth,
+            extra_disk: extras.extra_disk,
+            extra_bandwidth: extras.extra_bandwidth,
             custom_plan,
             back_url,
             submit_url: absolute_url_from_state(&state, "/create/step-7"),
@@ -547,8 +492,8 @@ async fn create_step_7_core(
         &query
     };
     let base = parse_wizard_base(source);
-    if base.hostnames.is_empty() || base.region.is_empty() {
-        return Redirect::to("/create/step-1").into_response();
+    if let Some(r) = ensure_wizard_base(&base) {
+        return r.into_response();
     }
     if base.os_id.is_empty() {
         return Redirect::to("/create/step-5").into_response();
@@ -559,123 +504,117 @@ async fn create_step_7_core(
         if plan_state.product_id.is_empty() {
             return Redirect::to("/create/step-3").into_response();
         }
-        plan_state.extra_disk = source
-            .get("extra_disk")
-            .cloned()
-            .unwrap_or_else(|| "0".into());
-        plan_state.extra_bandwidth = source
-            .get("extra_bandwidth")
-            .cloned()
-            .unwrap_or_else(|| "0".into());
+        plan_state.extra_disk = trimmed_field(source, "extra_disk", "0");
+        plan_state.extra_bandwidth = trimmed_field(source, "extra_bandwidth", "0");
     } else {
-        plan_state.cpu = source.get("cpu").cloned().unwrap_or_else(|| "2".into());
-        plan_state.ram_in_gb = source.get("ramInGB").cloned().unwrap_or_else(|| "4".into());
-        plan_state.disk_in_gb = source
-            .get("diskInGB")
-            .cloned()
-            .unwrap_or_else(|| "50".into());
-        plan_state.bandwidth_in_tb = source
-            .get("bandwidthInTB")
-            .cloned()
-            .unwrap_or_else(|| "1".into());
-    }
-    if method == axum::http::Method::POST {
-        let mut payload = serde_json::json!({
-            "hostnames": base.hostnames,
-            "region": base.region,
-            "class": base.instance_class,
-            "assignIpv4": base.assign_ipv4,
-            "assignIpv6": base.assign_ipv6,
-            "osId": base.os_id,
-        });
-        if let Some(ref app_id) = base.app_id {
-            if !app_id.is_empty() {
-                payload["appId"] = Value::from(app_id.clone());
+        plan_state.cpu = trimmed_field(source, "cpu", "2");
+        plan_state.ram_in_gb = trimmed_field(source, "ramInGB", "4");
+        plan_state.disk_in_gb = trimmed_field(source, "diskInGB", "50");
+        plan_state.bandwidth_in_tb = trimmed_field(source, "bandwidthInTB", "1");
+        // Validate the required resources in one pass; the back query is only
+        // encoded when a field actually fails.
+        let required = [
+            (&plan_state.cpu, "CPU"),
+            (&plan_state.ram_in_gb, "RAM (GB)"),
+            (&plan_state.disk_in_gb, "Disk (GB)"),
+        ];
+        if let Some((_, label)) = required
+            .iter()
+            .find(|(value, _)| value.parse::<i64>().map_or(true, |n| n <= 0))
+        {
+            if let Some(sid) = jar.get("session_id") {
+                let mut flashes = state.flash_store.lock().unwrap();
+                let entry = flashes.entry(sid.value().to_string()).or_default();
+                entry.push(format!("{} must be a positive whole number.", label));
             }
+            let mut custom_pairs = build_base_query_pairs(&base);
+            custom_pairs.push(("cpu".into(), plan_state.cpu.clone()));
+            custom_pairs.push(("ramInGB".into(), plan_state.ram_in_gb.clone()));
+            custom_pairs.push(("diskInGB".into(), plan_state.disk_in_gb.clone()));
+            custom_pairs.push(("bandwidthInTB".into(), plan_state.bandwidth_in_tb.clone()));
+            return Redirect::to(&url_with_query("/create/step-3", &custom_pairs)).into_response();
         }
-        if base.floating_ip_count > 0 {
-            payload["floatingIPCount"] = Value::from(base.floating_ip_count);
-        }
-        if !base.ssh_key_ids.is_empty() {
-            payload["sshKeyIds"] = Value::from(base.ssh_key_ids.clone());
-        }
-        if base.plan_type == "fixed" {
-            payload["productId"] = Value::from(plan_state.product_id.clone());
-            let mut extras = serde_json::Map::new();
-            if let Some(d) = plan_state
-                .extra_disk
-                .trim()
-                .parse::<i64>()
-                .ok()
-                .filter(|v| *v > 0)
-            {
-                extras.insert("diskInGB".into(), Value::from(d));
-            }
-            if let Some(b) = plan_state
-                .extra_bandwidth
-                .trim()
-                .parse::<i64>()
-                .ok()
-                .filter(|v| *v > 0)
-            {
-                extras.insert("bandwidthInTB".into(), Value::from(b));
-            }
-            if !extras.is_empty() {
-                payload["extraResource"] = Value::Object(extras);
-            }
-        } else {
-            let mut extras = serde_json::Map::new();
-            if let Some(cpu) = plan_state.cpu.trim().parse::<i64>().ok() {
-                extras.insert("cpu".into(), Value::from(cpu));
-            }
-            if let Some(ram) = plan_state.ram_in_gb.trim().parse::<i64>().ok() {
-                extras.insert("ramInGB".into(), Value::from(ram));
-            }
-            if let Some(disk) = plan_state.disk_in_gb.trim().parse::<i64>().ok() {
-                extras.insert("diskInGB".into(), Value::from(disk));
-            }
-            if let Some(bw) = plan_state.bandwidth_in_tb.trim().parse::<i64>().ok() {
-                extras.insert("bandwidthInTB".into(), Value::from(bw));
-            }
-            if !extras.is_empty() {
-                payload["extraResource"] = Value::Object(extras);
-            }
+    }
+    if method == axum::http::Method::POST {
+        return submit_review(&state, &jar, &base, &plan_state).await;
+    }
+    render_review(&state, &jar, &base, plan_state).await
+}
+
+/// Submit the instance creation request. Only the failure path renders a page,
+/// so the review summary is never built for a successful submission.
+async fn submit_review(
+    state: &AppState,
+    jar: &CookieJar,
+    base: &BaseState,
+    plan_state: &PlanState,
+) -> Response {
+    let mut payload = serde_json::json!({
+        "hostnames": base.hostnames,
+        "region": base.region,
+        "class": base.instance_class,
+        "assignIpv4": base.assign_ipv4,
+        "assignIpv6": base.assign_ipv6,
+        "osId": base.os_id,
+    });
+    if let Some(ref app_id) = base.app_id {
+        if !app_id.is_empty() {
+            payload["appId"] = Value::from(app_id.clone());
         }
-        let resp = api_call_wrapper(&state, "POST", "/v1/instances", Some(payload.clone()), None).await;
-        
-        // Debug logging for creation failure
-        tracing::info!(?payload, ?resp, "Create Instance Attempt");
+    }
+    if base.floating_ip_count > 0 {
+        payload["floatingIPCount"] = Value::from(base.floating_ip_count);
+    }
+    if !base.ssh_key_ids.is_empty() {
+        payload["sshKeyIds"] = Value::from(base.ssh_key_ids.clone());
+    }
+    // Fixed plans send only the positive disk/bandwidth add-ons; custom plans
+    // send every resource that parses.
+    let is_fixed = base.plan_type == "fixed";
+    if is_fixed {
+        payload["productId"] = Value::from(plan_state.product_id.clone());
+    }
+    let fixed_fields = [
+        ("diskInGB", &plan_state.extra_disk),
+        ("bandwidthInTB", &plan_state.extra_bandwidth),
+    ];
+    let custom_fields = [
+        ("cpu", &plan_state.cpu),
+        ("ramInGB", &plan_state.ram_in_gb),
+        ("diskInGB", &plan_state.disk_in_gb),
+        ("bandwidthInTB", &plan_state.bandwidth_in_tb),
+    ];
+    let fields: &[(&str, &String)] = if is_fixed { &fixed_fields } else { &custom_fields };
+    let extra_resource: serde_json::Map<String, Value> = fields
+        .iter()
+        .filter_map(|(key, raw)| {
+            let n = raw.parse::<i64>().ok()?;
+            (!is_fixed || n > 0).then(|| (key.to_string(), Value::from(n)))
+        })
+        .collect();
+    if !extra_resource.is_empty() {
+        payload["extraResource"] = Value::Object(extra_resource);
+    }
+    // api_call_wrapper already logs the request body and response for this
+    // endpoint, so the payload is handed over rather than cloned for logging.
+    let resp = api_call_wrapper(state, "POST", "/v1/instances", Some(payload), None).await;
 
-        if resp.get("code").and_then(|c| c.as_str()) == Some("OKAY")
-            || resp.get("code").and_then(|c| c.as_str()) == Some("CREATED")
-        {
-            return Redirect::to("/instances").into_response();
-        } else {
-            // Build error / result page
-            let mut errors: Vec<String> = Vec::new();
-            if let Some(detail) = resp.get("detail").and_then(|d| d.as_str()) {
-                if !detail.trim().is_empty() {
-                    errors.push(detail.to_string());
-                }
-            }
-            // Some APIs return 'errors' as array or map
-            if let Some(arr) = resp.get("errors").and_then(|e| e.as_array()) {
-                for entry in arr {
-                    if let Some(s) = entry.as_str() {
-                        errors.push(s.to_string());
-                    } else if let Some(obj) = entry.as_object() {
-                        for (k, v) in obj {
-                            if let Some(s) = v.as_str() {
-                                errors.push(format!("{}: {}", k, s));
-                            } else {
-                                errors.push(format!("{}: {}", k, value_to_short_string(v)));
-                            }
-                        }
-                    } else {
-                        errors.push(value_to_short_string(entry));
-                    }
-                }
-            } else if let Some(obj) = resp.get("errors").and_then(|e| e.as_object()) {
+    if matches!(resp.get("code").and_then(|c| c.as_str()), Some("OKAY" | "CREATED")) {
+        return Redirect::to("/instances").into_response();
+    }
+    // Build error / result page
+    let mut errors: Vec<String> = Vec::new();
+    if let Some(detail) = resp.get("detail").and_then(|d| d.as_str()) {
+        if !detail.trim().is_empty() {
+            errors.push(detail.to_string());
+        }
+    }
+    // Some APIs return 'errors' as array or map
+    if let Some(arr) = resp.get("errors").and_then(|e| e.as_array()) {
+        for entry in arr {
+            if let Some(s) = entry.as_str() {
+                errors.push(s.to_string());
+            } else if let Some(obj) = entry.as_object() {
                 for (k, v) in obj {
                     if let Some(s) = v.as_str() {
                         errors.push(format!("{}: {}", k, s));
@@ -683,95 +622,118 @@ async fn create_step_7_core(
                         errors.push(format!("{}: {}", k, value_to_short_string(v)));
                     }
                 }
+            } else {
+                errors.push(value_to_short_string(entry));
+            }
+        }
+    } else if let Some(obj) = resp.get("errors").and_then(|e| e.as_object()) {
+        for (k, v) in obj {
+            if let Some(s) = v.as_str() {
+                errors.push(format!("{}: {}", k, s));
+            } else {
+                errors.push(format!("{}: {}", k, value_to_short_string(v)));
             }
-            let code = resp.get("code").and_then(|c| c.as_str()).map(|s| s.to_string());
-            let detail = resp.get("detail").and_then(|d| d.as_str()).map(|s| s.to_string());
-            // Do not expose raw JSON to rendered templates - keep UI friendly.
-            let TemplateGlobals { current_user, api_hostname, base_url, flash_messages, has_flash_messages } = build_template_globals(&state, &jar);
-                return render_template(&state, &jar, Step8Template {
-                    current_user,
-                    api_hostname,
-                    base_url,
-                    flash_messages,
-                    has_flash_messages,
-                    back_url: absolute_url_from_state(&state, "/create/step-6"),
-                    status_label: "Failed".into(),
-                    code,
-                    detail,
-                    errors,
-                });
         }
     }
+    let code = resp.get("code").and_then(|c| c.as_str()).map(|s| s.to_string());
+    let detail = resp.get("detail").and_then(|d| d.as_str()).map(|s| s.to_string());
+    // Do not expose raw JSON to rendered templates - keep UI friendly.
+    let TemplateGlobals { current_user, api_hostname, base_url, flash_messages, has_flash_messages } = build_template_globals(state, jar);
+    render_template(state, jar, Step8Template {
+        current_user,
+        api_hostname,
+        base_url,
+        flash_messages,
+        has_flash_messages,
+        back_url: absolute_url_from_state(state, "/create/step-6"),
+        status_label: "Failed".into(),
+        code,
+        detail,
+        errors,
+    })
+}
+
+/// Render the review page summarising the wizard selections.
+async fn render_review(
+    state: &AppState,
+    jar: &CookieJar,
+    base: &BaseState,
+    plan_state: PlanState,
+) -> Response {
     let TemplateGlobals {
         current_user,
         api_hostname,
         base_url,
         flash_messages,
         has_flash_messages,
-    } = build_template_globals(&state, &jar);
+    } = build_template_globals(state, jar);
+    let selected_key_ids = &base.ssh_key_ids_str;
+    // The product list, OS catalog and SSH keys are independent upstream
+    // fetches; run them concurrently so the page waits for the slowest only.
+    let products_fut = async {
+        if base.plan_type == "fixed" {
+            load_product_catalog(state, &base.region).await
+        } else {
+            Default::default()
+        }
+    };
+    let ssh_keys_fut = async {
+        if selected_key_ids.is_empty() {
+            Default::default()
+        } else {
+            let customer_id = fetch_default_customer_id(state).await;
+            load_ssh_keys_api(state, customer_id).await
+        }
+    };
+    let (products, os_catalog, ssh_keys) =
+        tokio::join!(products_fut, load_os_catalog(state), ssh_keys_fut);
+
     let mut plan_summary = Vec::new();
     let mut price_entries = Vec::new();
     let mut footnote = None;
     
     if base.plan_type == "fixed" {
-        let products = load_products_wrapper(&state, &base.region).await;
-        if let Some(prod) = products.into_iter().find(|p| p.id == plan_state.product_id) {
+        if let Some(prod) = products.get(&plan_state.product_id) {
             plan_summary = prod.spec_entries.clone();
             price_entries = prod.price_entries.clone();
-            let desc = prod.description.clone();
-            if !desc.trim().is_empty() {
-                footnote = Some(desc.clone());
+            if !prod.description.trim().is_empty() {
+                footnote = Some(prod.description.clone());
             }
         }
     } else {
-        let mut summary = Vec::new();
-        if !plan_state.cpu.trim().is_empty() {
-            summary.push(ProductEntry {
-                term: "vCPU".into(),
-                value: plan_state.cpu.clone(),
-            });
-        }
-        if !plan_state.ram_in_gb.trim().is_empty() {
-            summary.push(ProductEntry {
-                term: "RAM (GB)".into(),
-                value: plan_state.ram_in_gb.clone(),
-            });
-        }
-        if !plan_state.disk_in_gb.trim().is_empty() {
-            summary.push(ProductEntry {
-                term: "Disk (GB)".into(),
-                value: plan_state.disk_in_gb.clone(),
-            });
-        }
-        if !plan_state.bandwidth_in_tb.trim().is_empty() {
-            summary.push(ProductEntry {
-                term: "Bandwidth (TB)".into(),
-                value: plan_state.bandwidth_in_tb.clone(),
-            });
-        }
-        plan_summary = summary;
+        // Build the custom plan summary from a field table in a single pass.
+        let fields = [
+            ("vCPU", &plan_state.cpu),
+            ("RAM (GB)", &plan_state.ram_in_gb),
+            ("Disk (GB)", &plan_state.disk_in_gb),
+            ("Bandwidth (TB)", &plan_state.bandwidth_in_tb),
+        ];
+        plan_summary = fields
+            .into_iter()
+            .filter(|(_, value)| !value.is_empty())
+            .map(|(term, value)| ProductEntry {
+                term: term.into(),
+                value: value.clone(),
+            })
+            .collect();
     }
-    let os_list = load_os_list_wrapper(&state).await;
-    let selected_os_label = os_list
+    let selected_os_label = os_catalog
+        .items
         .iter()
         .find(|os| os.id == base.os_id)
         .map(|os| os.name.clone())
         .unwrap_or_else(|| base.os_id.clone());
-    let selected_key_ids: Vec<String> = base.ssh_key_ids.iter().map(|id| id.to_string()).collect();
     let ssh_keys_display = if selected_key_ids.is_empty() {
         "None".into()
     } else {
-        let id_set: HashSet<_> = selected_key_ids.iter().cloned().collect();
-        let customer_id = fetch_default_customer_id(&state).await;
-        let ssh_keys = load_ssh_keys_api(&state, customer_id).await;
         let mut names = Vec::new();
-        for key in ssh_keys {
-            if id_set.contains(&key.id) {
-                names.push(key.name);
+        for key in ssh_keys.iter() {
+            if selected_key_ids.contains(&key.id) {
+                names.push(key.name.as_str());
             }
         }
         if names.is_empty() {
-            format!("{} SSH key(s)", id_set.len())
+            format!("{} SSH key(s)", selected_key_ids.len())
         } else {
             names.join(", ")
         }
@@ -792,7 +754,7 @@ async fn create_step_7_core(
     } else {
         "Custom plan".into()
     };
-    let mut back_pairs = build_base_query_pairs(&base);
+    let mut back_pairs = build_base_query_pairs(base);
     if base.plan_type == "fixed" {
         back_pairs.push(("product_id".into(), plan_state.product_id.clone()));
         back_pairs.push(("extra_disk".into(), plan_state.extra_disk.clone()));
@@ -803,23 +765,18 @@ async fn create_step_7_core(
         back_pairs.push(("diskInGB".into(), plan_state.disk_in_gb.clone()));
         back_pairs.push(("bandwidthInTB".into(), plan_state.bandwidth_in_tb.clone()));
     }
-    let back_q = build_query_string(&back_pairs);
-    let back_url = if back_q.is_empty() {
-        absolute_url_from_state(&state, "/create/step-6")
-    } else {
-        absolute_url_from_state(&state, &format!("/create/step-6?{}", back_q))
-    };
+    let back_url = absolute_url_from_state(state, &url_with_query("/create/step-6", &back_pairs));
     let has_plan_summary = !plan_summary.is_empty();
     let has_price_entries = !price_entries.is_empty();
     let footnote_text = footnote.unwrap_or_default();
     let has_footnote = !footnote_text.is_empty();
-    render_template(&state, &jar, Step7Template {
+    render_template(state, jar, Step7Template {
             current_user,
             api_hostname,
             base_url,
             flash_messages,
             has_flash_messages,
-            base_state: &base,
+            base_state: base,
             floating_ip_count: base.floating_ip_count.to_string(),
             plan_state,
             plan_type_label,
@@ -839,7 +796,7 @@ async fn create_step_7_core(
             footnote_text,
             has_footnote,
             back_url,
-            submit_url: absolute_url_from_state(&state, "/create/step-7"),
+            submit_url: absolute_url_from_state(state, "/create/step-7"),
         },
     )
 }
@@ -885,18 +842,71 @@ pub async fn create_step_8(
 pub async fn create_step_7_post(
     State(state): State<AppState>,
     jar: CookieJar,
-    axum::extract::Query(q): axum::extract::Query<HashMap<String, OneOrMany>>,
     body: axum::body::Bytes,
 ) -> impl IntoResponse {
-    let mut q_flat: HashMap<String, String> = HashMap::new();
-    for (k, v) in q {
-        q_flat.insert(k, v.to_csv());
-    }
-    // Try to parse as HashMap<String, Vec<String>> first
+    // POSTs read the wizard state from the form only, so the query string is
+    // not parsed at all.
     let mut f_flat: HashMap<String, String> = HashMap::new();
     let parsed_map = parse_urlencoded_body(&body);
     for (k, v) in parsed_map {
         f_flat.insert(k, v.join(","));
     }
-    create_step_7_core(state, jar, axum::http::Method::POST, q_flat, f_flat).await
+    create_step_7_core(state, jar, axum::http::Method::POST, HashMap::new(), f_flat).await
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use crate::handlers::helpers::take_flash_messages;
+
+    /// Review a custom plan with the given resources; returns the redirect
+    /// target and the flash messages it queued.
+    async fn review_custom_plan(cpu: &str, ram: &str, disk: &str) -> (String, Vec<String>) {
+        let state = AppState::for_tests();
+        let jar = state.sign_in("alice", "admin");
+        let query: HashMap<String, String> = [
+            ("hostnames", "web-1"),
+            ("region", "us-1"),
+            ("plan_type", "custom"),
+            ("os_id", "ubuntu-24"),
+            ("cpu", cpu),
+            ("ramInGB", ram),
+            ("diskInGB", disk),
+        ]
+        .into_iter()
+        .map(|(k, v)| (k.to_string(), v.to_string()))
+        .collect();
+        let response = create_step_7_core(state.clone(), jar.clone(), axum::http::Method::GET, query, HashMap::new())
+            .await
+            .into_response();
+        let location = response
+            .headers()
+            .get(axum::http::header::LOCATION)
+            .and_then(|v| v.to_str().ok())
+            .unwrap_or_default()
+            .to_string();
+        (location, take_flash_messages(&state, &jar))
+    }
+
+    #[tokio::test]
+    async fn step_7_sends_non_positive_resources_back_to_step_3() {
+        let cases = [
+            ("0", "4", "50", "CPU"),
+            ("2", "abc", "50", "RAM (GB)"),
+            ("2", "4", "-1", "Disk (GB)"),
+        ];
+        for (cpu, ram, disk, label) in cases {
+            let (location, flashes) = review_custom_plan(cpu, ram, disk).await;
+            assert!(location.starts_with("/create/step-3?"), "{location}");
+            assert!(location.contains("plan_type=custom"), "{location}");
+            assert!(location.contains(&format!("cpu={cpu}")), "{location}");
+            assert_eq!(flashes, [format!("{label} must be a positive whole number.")]);
+        }
+    }
+
+    #[tokio::test]
+    async fn step_7_reports_only_the_first_invalid_resource() {
+        let (_, flashes) = review_custom_plan("0", "0", "0").await;
+        assert_eq!(flashes, ["CPU must be a positive whole number."]);
+    }
 }
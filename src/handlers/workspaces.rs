@@ -342,17 +342,20 @@ pub async fn workspace_assign_instances(
     if let Some(r) = ensure_owner(&state, &jar) {
         return r.into_response();
     }
+    // Normalize before taking the workspaces lock; blank entries are dropped
+    // before anything is allocated for them.
+    let mut ids: Vec<String> = form
+        .instances
+        .iter()
+        .map(|s| s.trim())
+        .filter(|s| !s.is_empty())
+        .map(str::to_string)
+        .collect();
+    ids.sort();
+    ids.dedup();
     {
         let mut ws = state.workspaces.lock().unwrap();
         if let Some(rec) = ws.get_mut(&slug) {
-            let mut ids: Vec<String> = form
-                .instances
-                .iter()
-                .map(|s| s.trim().to_string())
-                .filter(|s| !s.is_empty())
-                .collect();
-            ids.sort();
-            ids.dedup();
             rec.assigned_instances = ids;
         } else {
             return plain_html("Workspace not found");
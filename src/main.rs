@@ -52,8 +52,19 @@ async fn build_state_from_env(env_file: Option<&str>) -> AppState {
         .map(|o| String::from_utf8_lossy(&o.stdout).trim().to_string())
         .unwrap_or_default();
 
+    let catalog_ttl = std::time::Duration::from_secs(config::DEFAULT_CATALOG_CACHE_TTL_SECS);
+    let hostname_ttl = std::time::Duration::from_secs(config::DEFAULT_INSTANCE_HOSTNAME_CACHE_TTL_SECS);
+    let ssh_key_ttl = std::time::Duration::from_secs(config::DEFAULT_SSH_KEY_CACHE_TTL_SECS);
+    let product_ttl = std::time::Duration::from_secs(config::DEFAULT_PRODUCT_CACHE_TTL_SECS);
+
+    // One client for the whole process so every API call reuses pooled
+    // keep-alive connections instead of paying a fresh TCP/TLS handshake.
     let client = reqwest::Client::builder()
         .user_agent(format!("Zy/{}", env!("CARGO_PKG_VERSION")))
+        .pool_max_idle_per_host(config::DEFAULT_HTTP_POOL_MAX_IDLE_PER_HOST)
+        .pool_idle_timeout(std::time::Duration::from_secs(config::DEFAULT_HTTP_POOL_IDLE_TIMEOUT_SECS))
+        .tcp_keepalive(std::time::Duration::from_secs(config::DEFAULT_HTTP_TCP_KEEPALIVE_SECS))
+        .connect_timeout(std::time::Duration::from_secs(config::DEFAULT_HTTP_CONNECT_TIMEOUT_SECS))
         .build()
         .expect("Failed to create HTTP client");
     
@@ -62,6 +73,12 @@ async fn build_state_from_env(env_file: Option<&str>) -> AppState {
         sessions: Arc::new(Mutex::new(HashMap::new())),
         flash_store: Arc::new(Mutex::new(HashMap::new())),
         default_customer_cache: Arc::new(Mutex::new(None)),
+        os_catalog_cache: Arc::new(utils::TtlCache::new(catalog_ttl)),
+        region_catalog_cache: Arc::new(utils::TtlCache::new(catalog_ttl)),
+        applications_cache: Arc::new(utils::TtlCache::new(catalog_ttl)),
+        ssh_keys_cache: Arc::new(utils::TtlCache::new(ssh_key_ttl)),
+        products_cache: Arc::new(utils::TtlCache::new(product_ttl)),
+        instance_hostname_cache: Arc::new(utils::TtlCache::new(hostname_ttl)),
         api_base_url: config::get_api_base_url(),
         api_token: config::get_api_token(),
         public_base_url: config::get_public_base_url(),
@@ -3,7 +3,13 @@ use std::sync::{Arc, Mutex};
 
 use crate::models::user_record::UserRecord;
 use crate::models::workspace_record::WorkspaceRecord;
+use crate::models::os_item::OsCatalog;
+use crate::models::region::RegionCatalog;
+use crate::models::ssh_key_view::SshKeyView;
+use crate::models::product_view::ProductCatalog;
+use crate::api::Application;
 use crate::mcp::log::McpLogStore;
+use crate::utils::TtlCache;
 
 #[derive(Clone)]
 pub struct AppState {
@@ -11,6 +17,19 @@ pub struct AppState {
     pub sessions: Arc<Mutex<HashMap<String, String>>>,
     pub flash_store: Arc<Mutex<HashMap<String, Vec<String>>>>,
     pub default_customer_cache: Arc<Mutex<Option<String>>>,
+    /// Short-lived cache of the `/v1/os` catalog shared by the wizard and instance pages.
+    pub os_catalog_cache: Arc<TtlCache<(), OsCatalog>>,
+    /// Short-lived cache of the `/v1/regions` catalog.
+    pub region_catalog_cache: Arc<TtlCache<(), RegionCatalog>>,
+    /// Short-lived cache of the `/v1/applications` catalog.
+    pub applications_cache: Arc<TtlCache<(), Vec<Application>>>,
+    /// SSH keys keyed by customer id; cleared whenever a key is created or deleted.
+    pub ssh_keys_cache: Arc<TtlCache<Option<String>, Vec<SshKeyView>>>,
+    /// `/v1/products` catalogs keyed by region id.
+    pub products_cache: Arc<TtlCache<String, ProductCatalog>>,
+    /// Instance hostnames keyed by instance id, so action POSTs can run the
+    /// hostname-block check without re-fetching the instance.
+    pub instance_hostname_cache: Arc<TtlCache<String, String>>,
     pub api_base_url: String,
     pub api_token: String,
     pub public_base_url: String,
@@ -36,3 +55,49 @@ impl AppState {
         self.current_hostname.to_lowercase() == instance_hostname.to_lowercase()
     }
 }
+
+#[cfg(test)]
+impl AppState {
+    /// Empty state for handler tests: no API configured, no users and cold caches.
+    pub fn for_tests() -> Self {
+        let ttl = std::time::Duration::from_secs(60);
+        AppState {
+            users: Arc::new(Mutex::new(HashMap::new())),
+            sessions: Arc::new(Mutex::new(HashMap::new())),
+            flash_store: Arc::new(Mutex::new(HashMap::new())),
+            default_customer_cache: Arc::new(Mutex::new(None)),
+            os_catalog_cache: Arc::new(TtlCache::new(ttl)),
+            region_catalog_cache: Arc::new(TtlCache::new(ttl)),
+            applications_cache: Arc::new(TtlCache::new(ttl)),
+            ssh_keys_cache: Arc::new(TtlCache::new(ttl)),
+            products_cache: Arc::new(TtlCache::new(ttl)),
+            instance_hostname_cache: Arc::new(TtlCache::new(ttl)),
+            api_base_url: String::new(),
+            api_token: String::new(),
+            public_base_url: String::new(),
+            client: reqwest::Client::new(),
+            disabled_instances: Arc::new(Mutex::new(std::collections::HashSet::new())),
+            current_hostname: String::new(),
+            custom_css: None,
+            workspaces: Arc::new(Mutex::new(HashMap::new())),
+            mcp_log_store: McpLogStore::new(),
+        }
+    }
+
+    /// Add `username` with `role` and return a cookie jar signed in as them.
+    pub fn sign_in(&self, username: &str, role: &str) -> axum_extra::extract::cookie::CookieJar {
+        self.users.lock().unwrap().insert(
+            username.to_string(),
+            UserRecord {
+                password: String::new(),
+                role: role.to_string(),
+                assigned_instances: vec![],
+                about: String::new(),
+            },
+        );
+        let sid = format!("session-{username}");
+        self.sessions.lock().unwrap().insert(sid.clone(), username.to_string());
+        axum_extra::extract::cookie::CookieJar::new()
+            .add(axum_extra::extract::cookie::Cookie::new("session_id", sid))
+    }
+}
@@ -10,6 +10,9 @@ pub struct BaseState {
     pub assign_ipv6: bool,
     pub floating_ip_count: i32,
     pub ssh_key_ids: Vec<i64>,
+    /// `ssh_key_ids` pre-rendered as strings, filled once by `parse_wizard_base`.
+    #[serde(default)]
+    pub ssh_key_ids_str: Vec<String>,
     pub os_id: String,
     pub app_id: Option<String>,
 }
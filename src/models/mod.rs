@@ -35,10 +35,10 @@ pub use base_state::BaseState;
 pub use region_selection_form::RegionSelectionFormStep1;
 pub use network_configuration_form::NetworkConfigurationFormStep2;
 pub use custom_plan_specification_form::CustomPlanSpecificationFormStep3;
-pub use region::Region;
+pub use region::{Region, RegionCatalog};
 pub use product_entry::ProductEntry;
-pub use product_view::ProductView;
-pub use os_item::OsItem;
+pub use product_view::{ProductView, ProductCatalog};
+pub use os_item::{OsItem, OsCatalog};
 pub use instance_view::InstanceView;
 pub use ssh_key_view::SshKeyView;
 pub use ssh_key_display::SshKeyDisplay;
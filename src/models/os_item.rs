@@ -11,3 +11,52 @@ pub struct OsItem {
     pub is_default: bool,
     pub is_active: bool,
 }
+
+/// OS catalog as returned by `/v1/os`, with the default image resolved once
+/// when the catalog is loaded rather than on every wizard render.
+#[derive(Clone, Debug, Default)]
+pub struct OsCatalog {
+    pub items: Vec<OsItem>,
+    pub default_id: Option<String>,
+}
+
+impl OsCatalog {
+    pub fn new(items: Vec<OsItem>) -> Self {
+        let default_id = items
+            .iter()
+            .find(|o| o.is_default)
+            .or_else(|| items.first())
+            .map(|o| o.id.clone());
+        Self { items, default_id }
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn os(id: &str, is_default: bool) -> OsItem {
+        OsItem {
+            id: id.to_string(),
+            name: id.to_string(),
+            family: "linux".to_string(),
+            arch: None,
+            min_ram: None,
+            is_default,
+            is_active: true,
+        }
+    }
+
+    #[test]
+    fn default_id_prefers_the_flagged_image() {
+        let catalog = OsCatalog::new(vec![os("debian-12", false), os("ubuntu-24", true)]);
+        assert_eq!(catalog.default_id.as_deref(), Some("ubuntu-24"));
+    }
+
+    #[test]
+    fn default_id_falls_back_to_the_first_image() {
+        let catalog = OsCatalog::new(vec![os("debian-12", false), os("ubuntu-24", false)]);
+        assert_eq!(catalog.default_id.as_deref(), Some("debian-12"));
+        assert_eq!(OsCatalog::new(vec![]).default_id, None);
+    }
+}
@@ -1,8 +1,10 @@
+use std::collections::HashMap;
+
 use serde::{Deserialize, Serialize};
 
 use crate::models::product_entry::ProductEntry;
 
-#[derive(Serialize, Deserialize, Clone, Debug)]
+#[derive(Serialize, Deserialize, Clone, Debug, Default)]
 pub struct PlanSpecification {
     pub cpu: f64,
     pub ram: f64,
@@ -59,3 +61,75 @@ pub struct ProductView {
     #[serde(skip)]
     pub price_entries: Vec<ProductEntry>,
 }
+
+/// Products offered in one region together with an id index, built once when
+/// the list is loaded so lookups by product id don't rescan it per request.
+#[derive(Clone, Debug, Default)]
+pub struct ProductCatalog {
+    pub items: Vec<ProductView>,
+    by_id: HashMap<String, usize>,
+}
+
+impl ProductCatalog {
+    pub fn new(items: Vec<ProductView>) -> Self {
+        let by_id = items
+            .iter()
+            .enumerate()
+            .map(|(i, p)| (p.id.clone(), i))
+            .collect();
+        Self { items, by_id }
+    }
+
+    pub fn get(&self, id: &str) -> Option<&ProductView> {
+        self.by_id.get(id).map(|&i| &self.items[i])
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn product(id: &str) -> ProductView {
+        ProductView {
+            id: id.to_string(),
+            region_id: String::new(),
+            plan_id: String::new(),
+            is_active: true,
+            network_max_rate: 0.0,
+            network_max_rate95: 0.0,
+            discount_percent: 0,
+            remaining_actual_stock: None,
+            remaining_preorder_capacity: None,
+            plan: Plan {
+                id: String::new(),
+                plan_type: None,
+                gpu_name: None,
+                gpu_quantity: None,
+                specification: PlanSpecification::default(),
+                is_active: true,
+            },
+            overall_activeness: true,
+            ddos_activeness: None,
+            price_items: vec![],
+            description: String::new(),
+            tags: String::new(),
+            spec_entries: vec![],
+            price_entries: vec![],
+        }
+    }
+
+    #[test]
+    fn catalog_get_finds_products_by_id() {
+        let catalog = ProductCatalog::new(vec![product("p-1"), product("p-2")]);
+        assert_eq!(catalog.get("p-2").map(|p| p.id.as_str()), Some("p-2"));
+        assert_eq!(catalog.get("p-1").map(|p| p.id.as_str()), Some("p-1"));
+        assert!(catalog.get("p-3").is_none());
+        assert_eq!(catalog.items.len(), 2);
+    }
+
+    #[test]
+    fn empty_catalog_finds_nothing() {
+        assert!(ProductCatalog::new(vec![]).get("p-1").is_none());
+        assert!(ProductCatalog::default().get("").is_none());
+    }
+}
@@ -32,3 +32,23 @@ pub struct Region {
     pub position: serde_json::Value, // HashMap<String, i32> in practice
     pub config: RegionConfig,
 }
+
+/// Regions as returned by `/v1/regions` together with the selectable
+/// (active, non-hidden) subset, built once when the catalog is loaded rather
+/// than on every request.
+#[derive(Clone, Debug, Default)]
+pub struct RegionCatalog {
+    pub regions: Vec<Region>,
+    pub active: Vec<Region>,
+}
+
+impl RegionCatalog {
+    pub fn new(regions: Vec<Region>) -> Self {
+        let active = regions
+            .iter()
+            .filter(|r| r.is_active && !r.is_hidden)
+            .cloned()
+            .collect();
+        Self { regions, active }
+    }
+}
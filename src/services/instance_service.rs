@@ -1,4 +1,5 @@
 use serde_json::Value;
+use std::sync::Arc;
 
 use crate::models::{AppState, InstanceView, OsItem};
 
@@ -26,21 +27,49 @@ pub async fn check_instance_block(state: &AppState, instance_id: &str, hostname:
         return Some(BlockReason::Blacklisted);
     }
     
+    // Without a configured host name nothing can match, so don't spend an
+    // instance lookup finding out.
+    if state.current_hostname.is_empty() {
+        return None;
+    }
+
     if let Some(h) = hostname {
         if state.is_hostname_blocked(h) {
             return Some(BlockReason::HostnameMatch(h.to_string()));
         }
     } else {
         // Fetch hostname if not provided
-        let instance = get_instance_for_action(state, instance_id).await;
-        if state.is_hostname_blocked(&instance.hostname) {
-            return Some(BlockReason::HostnameMatch(instance.hostname));
+        let hostname = instance_hostname(state, instance_id).await;
+        if state.is_hostname_blocked(&hostname) {
+            return Some(BlockReason::HostnameMatch(hostname.to_string()));
         }
     }
     
     None
 }
 
+/// Record a hostname seen while rendering an instance page so the following
+/// action POST can skip the extra instance lookup.
+pub fn remember_instance_hostname(state: &AppState, instance_id: &str, hostname: &str) {
+    state
+        .instance_hostname_cache
+        .insert(instance_id.to_string(), hostname.to_string());
+}
+
+async fn instance_hostname(state: &AppState, instance_id: &str) -> Arc<String> {
+    if let Some(hostname) = state.instance_hostname_cache.get(instance_id) {
+        return hostname;
+    }
+    let instance = get_instance_for_action(state, instance_id).await;
+    if instance.status.is_empty() {
+        // The lookup failed; don't pin the placeholder hostname in the cache.
+        return Arc::new(instance.hostname);
+    }
+    state
+        .instance_hostname_cache
+        .insert(instance_id.to_string(), instance.hostname)
+}
+
 pub async fn enforce_instance_access(state: &AppState, username: Option<&str>, instance_id: &str) -> bool {
     if let Some(username) = username {
         let users = state.users.lock().unwrap();
@@ -4,7 +4,7 @@ pub mod wizard_service;
 pub mod workspace_service;
 
 // Re-export commonly used functions
-pub use user_service::{generate_password_hash, verify_password, random_session_id, load_users_from_file, persist_users_file, load_clocked_instances_from_file, persist_clocked_instances_file};
+pub use user_service::{generate_password_hash, verify_password_blocking, needs_rehash, random_session_id, load_users_from_file, reload_users_if_changed, persist_users_file, load_clocked_instances_from_file, persist_clocked_instances_file};
 pub use instance_service::simple_instance_action;
 pub use wizard_service::{parse_wizard_base, build_base_query_pairs};
 pub use workspace_service::{load_workspaces_from_file, persist_workspaces_file, slugify, now_iso8601, get_accessible_instance_ids};
@@ -1,12 +1,15 @@
 use std::collections::HashMap;
-use std::sync::{Arc, Mutex};
+use std::sync::{Arc, Mutex, RwLock};
+use std::sync::atomic::{AtomicU64, Ordering};
+use std::time::SystemTime;
 use pbkdf2::pbkdf2_hmac;
 use sha2::Sha256;
 use rand::RngCore;
 use hex::encode as hex_encode;
 
-use crate::config::{DEFAULT_PBKDF2_ITERATIONS, DEFAULT_OWNER_USERNAME, DEFAULT_OWNER_PASSWORD, DEFAULT_OWNER_ROLE};
+use crate::config::{DEFAULT_PBKDF2_ITERATIONS, DEFAULT_USERS_RELOAD_CHECK_INTERVAL_MS, DEFAULT_OWNER_USERNAME, DEFAULT_OWNER_PASSWORD, DEFAULT_OWNER_ROLE};
 use crate::models::UserRecord;
+use crate::utils::write_file_atomic;
 
 pub fn generate_password_hash(password: &str) -> String {
     let mut salt_bytes = [0u8; 12];
@@ -34,54 +37,177 @@ pub fn verify_password(stored: &str, candidate: &str) -> bool {
     false
 }
 
+/// True when `stored` was hashed with fewer PBKDF2 iterations than the current default.
+pub fn needs_rehash(stored: &str) -> bool {
+    stored
+        .strip_prefix("pbkdf2:sha256:")
+        .and_then(|rest| rest.split_once('$'))
+        .and_then(|(iter_s, _)| iter_s.parse::<u32>().ok())
+        .map_or(true, |iter| iter < DEFAULT_PBKDF2_ITERATIONS)
+}
+
+/// Run `verify_password` on the blocking pool so PBKDF2 doesn't stall the async
+/// workers. For unknown users (`stored == None`) a dummy hash is still checked,
+/// keeping response time independent of whether the account exists.
+pub async fn verify_password_blocking(stored: Option<String>, candidate: String) -> bool {
+    let known = stored.is_some();
+    let stored = stored.unwrap_or_else(|| format!("pbkdf2:sha256:{}$$", DEFAULT_PBKDF2_ITERATIONS));
+    let ok = tokio::task::spawn_blocking(move || verify_password(&stored, &candidate))
+        .await
+        .unwrap_or(false);
+    known && ok
+}
+
 pub fn random_session_id() -> String {
     let mut b = [0u8; 16];
     rand::rngs::OsRng.fill_bytes(&mut b);
     hex_encode(b)
 }
 
+/// Build a `UserRecord` from one users.json entry, moving its strings out of
+/// the parsed document instead of copying them. Entries without a password
+/// are skipped; a missing role defaults to `admin`.
+fn user_record_from_json(v: serde_json::Value) -> Option<UserRecord> {
+    let serde_json::Value::Object(mut obj) = v else {
+        return None;
+    };
+    let mut take_string = |key: &str| match obj.remove(key) {
+        Some(serde_json::Value::String(s)) => Some(s),
+        _ => None,
+    };
+    let password = take_string("password")?;
+    let role = take_string("role").unwrap_or_else(|| "admin".to_string());
+    let about = take_string("about").unwrap_or_default();
+    let assigned_instances = match obj.remove("assigned_instances") {
+        Some(serde_json::Value::Array(arr)) => arr
+            .into_iter()
+            .filter_map(|x| match x {
+                serde_json::Value::String(s) => Some(s),
+                _ => None,
+            })
+            .collect(),
+        _ => vec![],
+    };
+    Some(UserRecord {
+        password,
+        role,
+        assigned_instances,
+        about,
+    })
+}
+
+/// users.json together with this process's view of it. Loads, reloads and
+/// persists are serialized behind `io`; `mtime` records the file's mtime as of
+/// our own last load or write and is only updated while `io` is held, so our
+/// writes never look like external edits. Request paths read `mtime` and
+/// `next_check_ms` without touching `io`.
+struct UsersFile {
+    path: &'static str,
+    io: tokio::sync::Mutex<()>,
+    mtime: RwLock<Option<SystemTime>>,
+    check_interval_ms: u64,
+    next_check_ms: AtomicU64,
+}
+
+static USERS_FILE: UsersFile = UsersFile::new("users.json", DEFAULT_USERS_RELOAD_CHECK_INTERVAL_MS);
+
+impl UsersFile {
+    const fn new(path: &'static str, check_interval_ms: u64) -> Self {
+        Self {
+            path,
+            io: tokio::sync::Mutex::const_new(()),
+            mtime: RwLock::new(None),
+            check_interval_ms,
+            next_check_ms: AtomicU64::new(0),
+        }
+    }
+
+    async fn mtime_on_disk(&self) -> Option<SystemTime> {
+        tokio::fs::metadata(self.path).await.and_then(|m| m.modified()).ok()
+    }
+
+    fn known_mtime(&self) -> Option<SystemTime> {
+        *self.mtime.read().unwrap()
+    }
+
+    /// The on-disk mtime, if it differs from what we last loaded or wrote.
+    async fn changed_on_disk(&self) -> Option<SystemTime> {
+        let known = self.known_mtime();
+        self.mtime_on_disk().await.filter(|m| Some(*m) != known)
+    }
+
+    /// Claim the next due check, so at most one request per interval stats the file.
+    fn claim_check(&self) -> bool {
+        let now = SystemTime::now()
+            .duration_since(SystemTime::UNIX_EPOCH)
+            .map_or(0, |d| d.as_millis() as u64);
+        let next = self.next_check_ms.load(Ordering::Relaxed);
+        now >= next
+            && self
+                .next_check_ms
+                .compare_exchange(next, now + self.check_interval_ms, Ordering::Relaxed, Ordering::Relaxed)
+                .is_ok()
+    }
+
+    /// Reload into `users_arc` if the file changed on disk since this process
+    /// last loaded or wrote it. Returns whether the in-memory map was replaced.
+    async fn reload_if_changed(&self, users_arc: &Arc<Mutex<HashMap<String, UserRecord>>>) -> bool {
+        if !self.claim_check() || self.changed_on_disk().await.is_none() {
+            return false;
+        }
+        let _io = self.io.lock().await;
+        // A persist or another reload may have caught up while we waited.
+        let Some(mtime) = self.changed_on_disk().await else {
+            return false;
+        };
+        let Some(map) = read_users_file(self.path).await else {
+            return false;
+        };
+        *users_arc.lock().unwrap() = map;
+        *self.mtime.write().unwrap() = Some(mtime);
+        true
+    }
+
+    async fn persist(&self, users_arc: &Arc<Mutex<HashMap<String, UserRecord>>>) -> Result<(), std::io::Error> {
+        // Serialize under the io lock so overlapping persists write in order and
+        // the last one always carries the newest in-memory state.
+        let _io = self.io.lock().await;
+        let content = {
+            let users = users_arc.lock().unwrap();
+            serialize_users(&users)?
+        };
+        write_file_atomic(self.path, &content).await?;
+        *self.mtime.write().unwrap() = self.mtime_on_disk().await;
+        Ok(())
+    }
+}
+
+/// Parse a users file; `None` if it cannot be read or is not a JSON object.
+/// Malformed entries are skipped.
+async fn read_users_file(path: &str) -> Option<HashMap<String, UserRecord>> {
+    // Parse the raw bytes; from_slice validates UTF-8 as it goes, so a separate
+    // read_to_string pass is unnecessary.
+    let bytes = tokio::fs::read(path).await.ok()?;
+    let serde_json::Value::Object(obj) = serde_json::from_slice::<serde_json::Value>(&bytes).ok()? else {
+        return None;
+    };
+    let mut map = HashMap::with_capacity(obj.len());
+    for (k, v) in obj {
+        if let Some(rec) = user_record_from_json(v) {
+            map.insert(k.to_lowercase(), rec);
+        }
+    }
+    Some(map)
+}
+
 pub async fn load_users_from_file() -> Arc<Mutex<HashMap<String, UserRecord>>> {
-    let path = std::path::Path::new("users.json");
+    let _io = USERS_FILE.io.lock().await;
+    let path = std::path::Path::new(USERS_FILE.path);
     let mut map: HashMap<String, UserRecord> = HashMap::new();
     
     if path.exists() {
-        if let Ok(text) = tokio::fs::read_to_string(path).await {
-            if let Ok(json_val) = serde_json::from_str::<serde_json::Value>(&text) {
-                if let Some(obj) = json_val.as_object() {
-                    for (k, v) in obj.iter() {
-                        if let Some(pw) = v.get("password").and_then(|x| x.as_str()) {
-                            let role = v
-                                .get("role")
-                                .and_then(|x| x.as_str())
-                                .unwrap_or("admin")
-                                .to_string();
-                            let about = v
-                                .get("about")
-                                .and_then(|x| x.as_str())
-                                .unwrap_or("")
-                                .to_string();
-                            let assigned_instances = v
-                                .get("assigned_instances")
-                                .and_then(|a| a.as_array())
-                                .map(|arr| {
-                                    arr.iter()
-                                        .filter_map(|x| x.as_str().map(|s| s.to_string()))
-                                        .collect()
-                                })
-                                .unwrap_or_else(|| vec![]);
-                            map.insert(
-                                k.to_lowercase(),
-                                UserRecord {
-                                    password: pw.to_string(),
-                                    role,
-                                    assigned_instances,
-                                    about,
-                                },
-                            );
-                        }
-                    }
-                }
-            }
+        if let Some(loaded) = read_users_file(USERS_FILE.path).await {
+            map = loaded;
         }
     } else {
         let salt = {
@@ -102,39 +228,32 @@ pub async fn load_users_from_file() -> Arc<Mutex<HashMap<String, UserRecord>>> {
                 about: String::new(),
             },
         );
-        let mut serialized: serde_json::Map<String, serde_json::Value> = serde_json::Map::new();
-        for (u, rec) in map.iter() {
-            serialized.insert(u.clone(), serde_json::json!({
-                "password": rec.password, 
-                "role": rec.role, 
-                "assigned_instances": rec.assigned_instances,
-                "about": rec.about
-            }));
+        if let Ok(content) = serialize_users(&map) {
+            let _ = write_file_atomic(USERS_FILE.path, &content).await;
         }
-        let _ = tokio::fs::write(
-            path,
-            serde_json::to_string_pretty(&serde_json::Value::Object(serialized)).unwrap(),
-        ).await;
     }
+    *USERS_FILE.mtime.write().unwrap() = USERS_FILE.mtime_on_disk().await;
     
     Arc::new(Mutex::new(map))
 }
 
+/// Reload users.json into `users_arc` if it changed on disk since this process
+/// last loaded or wrote it (e.g. via `zy users ...`). Checked at most once per
+/// `DEFAULT_USERS_RELOAD_CHECK_INTERVAL_MS`; an unchanged file costs one stat
+/// and never waits on a persist in progress.
+pub async fn reload_users_if_changed(users_arc: &Arc<Mutex<HashMap<String, UserRecord>>>) {
+    USERS_FILE.reload_if_changed(users_arc).await;
+}
+
+/// Serialize users sorted by username, borrowing the records rather than
+/// copying them into an intermediate JSON tree.
+fn serialize_users(users: &HashMap<String, UserRecord>) -> serde_json::Result<String> {
+    let sorted: std::collections::BTreeMap<&String, &UserRecord> = users.iter().collect();
+    serde_json::to_string_pretty(&sorted)
+}
+
 pub async fn persist_users_file(users_arc: &Arc<Mutex<HashMap<String, UserRecord>>>) -> Result<(), std::io::Error> {
-    let content = {
-        let users = users_arc.lock().unwrap();
-        let mut serialized: serde_json::Map<String, serde_json::Value> = serde_json::Map::new();
-        for (u, rec) in users.iter() {
-            serialized.insert(u.clone(), serde_json::json!({
-                "password": rec.password, 
-                "role": rec.role, 
-                "assigned_instances": rec.assigned_instances,
-                "about": rec.about
-            }));
-        }
-        serde_json::to_string_pretty(&serde_json::Value::Object(serialized))?
-    };
-    tokio::fs::write("users.json", content).await
+    USERS_FILE.persist(users_arc).await
 }
 
 pub async fn load_clocked_instances_from_file() -> Option<std::collections::HashSet<String>> {
@@ -159,5 +278,131 @@ pub async fn persist_clocked_instances_file(ids: &std::collections::HashSet<Stri
     sorted.sort();
     let content = serde_json::to_string_pretty(&sorted)
         .map_err(|e| std::io::Error::new(std::io::ErrorKind::Other, e))?;
-    tokio::fs::write("clocked_instances.json", content).await
+    write_file_atomic("clocked_instances.json", &content).await
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_needs_rehash() {
+        assert!(!needs_rehash(&generate_password_hash("pw")));
+        assert!(needs_rehash("pbkdf2:sha256:1000$salt$hash"));
+        assert!(needs_rehash("scrypt:32768:8:1$salt$hash"));
+    }
+
+    #[test]
+    fn test_verify_password() {
+        let stored = generate_password_hash("secret");
+        assert!(verify_password(&stored, "secret"));
+        assert!(!verify_password(&stored, "wrong"));
+    }
+
+    #[test]
+    fn test_user_record_from_json() {
+        let rec = user_record_from_json(serde_json::json!({
+            "password": "hash",
+            "role": "viewer",
+            "about": "ops",
+            "assigned_instances": ["i-1", 2, "i-3"],
+        }))
+        .unwrap();
+        assert_eq!(rec.password, "hash");
+        assert_eq!(rec.role, "viewer");
+        assert_eq!(rec.about, "ops");
+        assert_eq!(rec.assigned_instances, ["i-1", "i-3"]);
+
+        let rec = user_record_from_json(serde_json::json!({"password": "hash", "assigned_instances": "i-1"})).unwrap();
+        assert_eq!(rec.role, "admin");
+        assert_eq!(rec.about, "");
+        assert!(rec.assigned_instances.is_empty());
+    }
+
+    #[test]
+    fn test_user_record_from_json_skips_malformed_entries() {
+        assert!(user_record_from_json(serde_json::json!({"role": "admin"})).is_none());
+        assert!(user_record_from_json(serde_json::json!({"password": 42})).is_none());
+        assert!(user_record_from_json(serde_json::json!("hash")).is_none());
+        assert!(user_record_from_json(serde_json::Value::Null).is_none());
+    }
+
+    #[tokio::test]
+    async fn test_read_users_file_skips_malformed_records() {
+        let dir = tempfile::tempdir().unwrap();
+        let path = dir.path().join("users.json");
+        let path = path.to_str().unwrap();
+        std::fs::write(
+            path,
+            r#"{"Alice": {"password": "a"}, "bob": {"role": "admin"}, "carol": [], "dave": {"password": "d"}}"#,
+        )
+        .unwrap();
+
+        let users = read_users_file(path).await.unwrap();
+        let mut names: Vec<&str> = users.keys().map(String::as_str).collect();
+        names.sort();
+        assert_eq!(names, ["alice", "dave"]);
+    }
+
+    #[tokio::test]
+    async fn test_read_users_file_rejects_unusable_files() {
+        let dir = tempfile::tempdir().unwrap();
+        let path = dir.path().join("users.json");
+        let path = path.to_str().unwrap();
+        assert!(read_users_file(path).await.is_none());
+        for content in ["", "not json", "[]", "{\"alice\": {\"password\": \"a\"}"] {
+            std::fs::write(path, content).unwrap();
+            assert!(read_users_file(path).await.is_none(), "{content:?}");
+        }
+    }
+
+    fn record(password: &str) -> UserRecord {
+        UserRecord {
+            password: password.into(),
+            role: "admin".into(),
+            assigned_instances: vec![],
+            about: String::new(),
+        }
+    }
+
+    /// A `UsersFile` in `dir` with no check throttle, seeded with `alice`.
+    async fn seeded_users_file(dir: &tempfile::TempDir) -> (UsersFile, Arc<Mutex<HashMap<String, UserRecord>>>) {
+        let path = dir.path().join("users.json").to_string_lossy().into_owned();
+        let file = UsersFile::new(Box::leak(path.into_boxed_str()), 0);
+        let users = Arc::new(Mutex::new(HashMap::from([("alice".to_string(), record("pw"))])));
+        file.persist(&users).await.unwrap();
+        (file, users)
+    }
+
+    #[tokio::test]
+    async fn test_reload_skips_unchanged_file() {
+        let dir = tempfile::tempdir().unwrap();
+        let (file, users) = seeded_users_file(&dir).await;
+        users.lock().unwrap().insert("bob".into(), record("pw"));
+
+        assert!(!file.reload_if_changed(&users).await);
+        assert!(users.lock().unwrap().contains_key("bob"));
+    }
+
+    #[tokio::test]
+    async fn test_reload_picks_up_external_edit() {
+        let dir = tempfile::tempdir().unwrap();
+        let (file, users) = seeded_users_file(&dir).await;
+        std::fs::write(file.path, r#"{"Carol": {"password": "x", "role": "viewer"}}"#).unwrap();
+        std::fs::File::options()
+            .write(true)
+            .open(file.path)
+            .unwrap()
+            .set_modified(SystemTime::now() + std::time::Duration::from_secs(60))
+            .unwrap();
+
+        assert!(file.reload_if_changed(&users).await);
+        {
+            let users = users.lock().unwrap();
+            assert!(!users.contains_key("alice"));
+            assert_eq!(users["carol"].role, "viewer");
+        }
+        // The reloaded mtime is now ours, so the next check is a no-op.
+        assert!(!file.reload_if_changed(&users).await);
+    }
 }
@@ -4,16 +4,17 @@ use crate::utils::{parse_flag, parse_optional_int, parse_int_list};
 use crate::models::BaseState;
 
 pub fn parse_wizard_base(query: &HashMap<String, String>) -> BaseState {
-    let mut hostnames: Vec<String> = query
+    // Trim and drop blanks on borrowed slices; only kept hostnames allocate.
+    let hostnames: Vec<String> = query
         .get("hostnames")
         .map(|v| {
             v.split(',')
-                .map(|s| s.trim().to_string())
+                .map(str::trim)
                 .filter(|s| !s.is_empty())
+                .map(str::to_owned)
                 .collect()
         })
         .unwrap_or_default();
-    hostnames.retain(|h| !h.is_empty());
     let region = query
         .get("region")
         .map(|s| s.trim().to_string())
@@ -31,15 +32,11 @@ pub fn parse_wizard_base(query: &HashMap<String, String>) -> BaseState {
     let assign_ipv4 = parse_flag(query.get("assign_ipv4"), true);
     let assign_ipv6 = parse_flag(query.get("assign_ipv6"), false);
     let floating_ip_count = parse_optional_int(query.get("floating_ip_count")).unwrap_or(0);
-    let ssh_raw = query
+    let ssh_key_ids = query
         .get("ssh_key_ids")
-        .map(|s| {
-            s.split(',')
-                .map(|p| p.trim().to_string())
-                .collect::<Vec<_>>()
-        })
+        .map(|s| parse_int_list(s.split(',')))
         .unwrap_or_default();
-    let ssh_key_ids = parse_int_list(&ssh_raw);
+    let ssh_key_ids_str = ssh_key_ids.iter().map(|id| id.to_string()).collect();
     let os_id = query
         .get("os_id")
         .map(|s| s.trim().to_string())
@@ -57,13 +54,16 @@ pub fn parse_wizard_base(query: &HashMap<String, String>) -> BaseState {
         assign_ipv6,
         floating_ip_count,
         ssh_key_ids,
+        ssh_key_ids_str,
         os_id,
         app_id,
     }
 }
 
 pub fn build_base_query_pairs(state: &BaseState) -> Vec<(String, String)> {
-    let mut pairs = Vec::new();
+    // Up to 8 single-valued keys below, plus room for the (at most four) plan
+    // fields callers append, so the vector is allocated exactly once.
+    let mut pairs = Vec::with_capacity(state.hostnames.len() + state.ssh_key_ids_str.len() + 8 + 4);
     for h in &state.hostnames {
         pairs.push(("hostnames".into(), h.clone()));
     }
@@ -80,8 +80,8 @@ pub fn build_base_query_pairs(state: &BaseState) -> Vec<(String, String)> {
             state.floating_ip_count.to_string(),
         ));
     }
-    for id in &state.ssh_key_ids {
-        pairs.push(("ssh_key_ids".into(), id.to_string()));
+    for id in &state.ssh_key_ids_str {
+        pairs.push(("ssh_key_ids".into(), id.clone()));
     }
     if !state.os_id.is_empty() {
         pairs.push(("os_id".into(), state.os_id.clone()));
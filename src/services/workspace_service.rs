@@ -2,6 +2,7 @@ use std::collections::HashMap;
 use std::sync::{Arc, Mutex};
 
 use crate::models::workspace_record::{WorkspaceMember, WorkspaceRecord, WorkspaceRole};
+use crate::utils::write_file_atomic;
 
 const WORKSPACES_FILE: &str = "workspaces.json";
 
@@ -122,7 +123,7 @@ pub async fn persist_workspaces_file(
             .collect();
         serde_json::to_string_pretty(&serde_json::Value::Array(arr))?
     };
-    tokio::fs::write(WORKSPACES_FILE, content).await
+    write_file_atomic(WORKSPACES_FILE, &content).await
 }
 
 /// Generate a URL-safe slug from a display name.
@@ -0,0 +1,73 @@
+use std::io::{self, Write};
+use std::path::{Path, PathBuf};
+
+/// Replace `path` atomically: write a uniquely named temp file next to it,
+/// fsync it, then rename it over the target. Concurrent writers never share a
+/// temp file, and a crash leaves either the old or the new contents in place.
+/// The target keeps its existing permissions.
+pub async fn write_file_atomic(path: &str, content: &str) -> Result<(), io::Error> {
+    let path = PathBuf::from(path);
+    let content = content.to_owned();
+    tokio::task::spawn_blocking(move || write_file_atomic_blocking(&path, content.as_bytes()))
+        .await
+        .map_err(|e| io::Error::new(io::ErrorKind::Other, e))?
+}
+
+fn write_file_atomic_blocking(path: &Path, content: &[u8]) -> Result<(), io::Error> {
+    let dir = match path.parent() {
+        Some(p) if !p.as_os_str().is_empty() => p,
+        _ => Path::new("."),
+    };
+    let mut builder = tempfile::Builder::new();
+    // NamedTempFile defaults to 0600; create new files the way fs::write
+    // would (0666 minus the umask) instead.
+    #[cfg(unix)]
+    {
+        use std::os::unix::fs::PermissionsExt;
+        builder.permissions(std::fs::Permissions::from_mode(0o666));
+    }
+    let mut tmp = builder.tempfile_in(dir)?;
+    if let Ok(meta) = std::fs::metadata(path) {
+        tmp.as_file().set_permissions(meta.permissions())?;
+    }
+    tmp.write_all(content)?;
+    tmp.as_file().sync_all()?;
+    tmp.persist(path)?;
+    Ok(())
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn replaces_content_without_leaving_temp_files() {
+        let dir = tempfile::tempdir().unwrap();
+        let path = dir.path().join("state.json");
+        std::fs::write(&path, "old").unwrap();
+
+        write_file_atomic_blocking(&path, b"new").unwrap();
+
+        assert_eq!(std::fs::read_to_string(&path).unwrap(), "new");
+        let names: Vec<_> = std::fs::read_dir(dir.path())
+            .unwrap()
+            .map(|e| e.unwrap().file_name())
+            .collect();
+        assert_eq!(names, vec![std::ffi::OsString::from("state.json")]);
+    }
+
+    #[cfg(unix)]
+    #[test]
+    fn keeps_existing_mode() {
+        use std::os::unix::fs::PermissionsExt;
+        let dir = tempfile::tempdir().unwrap();
+        let path = dir.path().join("state.json");
+        std::fs::write(&path, "old").unwrap();
+        std::fs::set_permissions(&path, std::fs::Permissions::from_mode(0o640)).unwrap();
+
+        write_file_atomic_blocking(&path, b"new").unwrap();
+
+        let mode = std::fs::metadata(&path).unwrap().permissions().mode();
+        assert_eq!(mode & 0o777, 0o640);
+    }
+}
@@ -0,0 +1,36 @@
+use sha2::{Digest, Sha256};
+
+/// Build a strong ETag (quoted) from a response body.
+pub fn etag_for(body: &[u8]) -> String {
+    format!("\"{}\"", hex::encode(&Sha256::digest(body)[..16]))
+}
+
+/// Whether an `If-None-Match` header value matches `etag`.
+/// Handles `*`, comma-separated lists and weak (`W/`) validators.
+pub fn etag_matches(if_none_match: &str, etag: &str) -> bool {
+    if_none_match.split(',').map(str::trim).any(|tag| {
+        tag == "*" || tag.strip_prefix("W/").unwrap_or(tag) == etag
+    })
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn etag_is_stable_and_quoted() {
+        let tag = etag_for(b"hello");
+        assert_eq!(tag, etag_for(b"hello"));
+        assert_ne!(tag, etag_for(b"world"));
+        assert!(tag.starts_with('"') && tag.ends_with('"'));
+    }
+
+    #[test]
+    fn matches_lists_weak_and_wildcard() {
+        let tag = etag_for(b"hello");
+        assert!(etag_matches(&tag, &tag));
+        assert!(etag_matches(&format!("\"x\", W/{}", tag), &tag));
+        assert!(etag_matches("*", &tag));
+        assert!(!etag_matches("\"x\"", &tag));
+    }
+}
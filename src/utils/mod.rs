@@ -12,12 +12,22 @@ pub mod parse_int_list;
 // Status formatting
 pub mod status_formatter;
 
+// Caching
+pub mod ttl_cache;
+pub mod etag;
+
+// Filesystem
+pub mod atomic_file;
+
 // Re-export all utilities for convenient access
 pub use url_encoding::parse_urlencoded_body;
 pub use url_parser::hostname_from_url;
 pub use url_builder::absolute_url;
-pub use query_string::build_query_string;
+pub use query_string::url_with_query;
+pub use etag::{etag_for, etag_matches};
 pub use parse_flag::parse_flag;
 pub use parse_int::parse_optional_int;
 pub use parse_int_list::parse_int_list;
 pub use status_formatter::format_status;
+pub use ttl_cache::TtlCache;
+pub use atomic_file::write_file_atomic;
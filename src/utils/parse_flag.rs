@@ -1,14 +1,44 @@
+const TRUTHY: [&str; 4] = ["1", "true", "yes", "on"];
+
 /// Parse a boolean flag from an optional string value
 pub fn parse_flag(value: Option<&String>, default: bool) -> bool {
     match value {
         Some(v) => {
-            let t = v.trim().to_lowercase();
+            let t = v.trim();
             if t.is_empty() {
                 default
             } else {
-                matches!(t.as_str(), "1" | "true" | "yes" | "on")
+                // Case-insensitive compare in place instead of allocating a lowercased copy.
+                TRUTHY.iter().any(|truthy| t.eq_ignore_ascii_case(truthy))
             }
         }
         None => default,
     }
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn truthy_values_match_case_insensitively() {
+        for value in ["1", "true", "TRUE", "Yes", "on", " On "] {
+            assert!(parse_flag(Some(&value.to_string()), false), "{value:?}");
+        }
+    }
+
+    #[test]
+    fn other_values_are_false() {
+        for value in ["0", "false", "no", "off", "y", "truthy"] {
+            assert!(!parse_flag(Some(&value.to_string()), true), "{value:?}");
+        }
+    }
+
+    #[test]
+    fn empty_or_missing_uses_default() {
+        assert!(parse_flag(None, true));
+        assert!(!parse_flag(None, false));
+        assert!(parse_flag(Some(&"   ".to_string()), true));
+        assert!(!parse_flag(Some(&String::new()), false));
+    }
+}
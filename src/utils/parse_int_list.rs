@@ -1,7 +1,10 @@
-/// Parse a list of integers from string values
-pub fn parse_int_list(values: &[String]) -> Vec<i64> {
+/// Parse a list of integers from string values, skipping blanks and junk
+pub fn parse_int_list<'a, I>(values: I) -> Vec<i64>
+where
+    I: IntoIterator<Item = &'a str>,
+{
     values
-        .iter()
+        .into_iter()
         .filter_map(|v| {
             let t = v.trim();
             if t.is_empty() {
@@ -12,3 +15,20 @@ pub fn parse_int_list(values: &[String]) -> Vec<i64> {
         })
         .collect()
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn skips_blanks_and_junk() {
+        assert_eq!(parse_int_list(" 1, ,x,-2 ,3.5,4".split(',')), vec![1, -2, 4]);
+    }
+
+    #[test]
+    fn accepts_any_str_iterator() {
+        let owned = vec!["7".to_string(), " 8 ".to_string()];
+        assert_eq!(parse_int_list(owned.iter().map(String::as_str)), vec![7, 8]);
+        assert!(parse_int_list(std::iter::empty()).is_empty());
+    }
+}
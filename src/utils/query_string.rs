@@ -1,18 +1,56 @@
-use urlencoding::encode;
-
-/// Build a query string from key-value pairs
-pub fn build_query_string(pairs: &[(String, String)]) -> String {
-    let mut first = true;
-    let mut out = String::new();
-    for (k, v) in pairs {
-        if !first {
+use urlencoding::Encoded;
+
+fn encoded_len_hint(pairs: &[(String, String)]) -> usize {
+    pairs.iter().map(|(k, v)| k.len() + v.len() + 2).sum()
+}
+
+// Percent-encode straight into `out`, sized for the unescaped input, instead
+// of allocating an encoded copy of every key and value.
+fn append_pairs(out: &mut String, pairs: &[(String, String)]) {
+    for (i, (k, v)) in pairs.iter().enumerate() {
+        if i > 0 {
             out.push('&');
-        } else {
-            first = false;
         }
-        out.push_str(&encode(k));
+        Encoded::str(k).append_to(out);
         out.push('=');
-        out.push_str(&encode(v));
+        Encoded::str(v).append_to(out);
+    }
+}
+
+/// Build `path?query` in one buffer, or just `path` when there are no pairs.
+pub fn url_with_query(path: &str, pairs: &[(String, String)]) -> String {
+    if pairs.is_empty() {
+        return path.to_string();
     }
+    let mut out = String::with_capacity(path.len() + 1 + encoded_len_hint(pairs));
+    out.push_str(path);
+    out.push('?');
+    append_pairs(&mut out, pairs);
     out
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn pairs(items: &[(&str, &str)]) -> Vec<(String, String)> {
+        items.iter().map(|(k, v)| (k.to_string(), v.to_string())).collect()
+    }
+
+    #[test]
+    fn no_pairs_returns_the_path() {
+        assert_eq!(url_with_query("/create/step-2", &[]), "/create/step-2");
+    }
+
+    #[test]
+    fn joins_pairs_in_order() {
+        let url = url_with_query("/create/step-3", &pairs(&[("region", "us-1"), ("plan_type", "fixed")]));
+        assert_eq!(url, "/create/step-3?region=us-1&plan_type=fixed");
+    }
+
+    #[test]
+    fn encodes_reserved_characters() {
+        let url = url_with_query("/p", &pairs(&[("a b", "x&y=z"), ("hosts", "web-1,web 2/#?+")]));
+        assert_eq!(url, "/p?a%20b=x%26y%3Dz&hosts=web-1%2Cweb%202%2F%23%3F%2B");
+    }
+}
@@ -0,0 +1,93 @@
+use std::borrow::Borrow;
+use std::collections::HashMap;
+use std::hash::Hash;
+use std::sync::{Arc, Mutex};
+use std::time::{Duration, Instant};
+
+/// In-process cache whose entries expire after a fixed time-to-live.
+///
+/// Values are handed out as `Arc`s so callers never hold the lock while
+/// rendering from them.
+pub struct TtlCache<K, V> {
+    ttl: Duration,
+    entries: Mutex<HashMap<K, (Instant, Arc<V>)>>,
+}
+
+impl<K: Eq + Hash, V> TtlCache<K, V> {
+    pub fn new(ttl: Duration) -> Self {
+        Self {
+            ttl,
+            entries: Mutex::new(HashMap::new()),
+        }
+    }
+
+    /// Return the cached value for `key` if it has not expired yet. An expired
+    /// entry is removed.
+    pub fn get<Q>(&self, key: &Q) -> Option<Arc<V>>
+    where
+        K: Borrow<Q>,
+        Q: Hash + Eq + ?Sized,
+    {
+        let mut entries = self.entries.lock().unwrap();
+        let (stored_at, value) = entries.get(key)?;
+        if stored_at.elapsed() < self.ttl {
+            return Some(Arc::clone(value));
+        }
+        entries.remove(key);
+        None
+    }
+
+    /// Store `value` under `key`, replacing any previous entry. Expired entries
+    /// for other keys are swept out at the same time, so per-key caches don't
+    /// grow with keys that are never read again.
+    pub fn insert(&self, key: K, value: V) -> Arc<V> {
+        let value = Arc::new(value);
+        let mut entries = self.entries.lock().unwrap();
+        entries.retain(|_, (stored_at, _)| stored_at.elapsed() < self.ttl);
+        entries.insert(key, (Instant::now(), Arc::clone(&value)));
+        value
+    }
+
+    /// Drop every entry, e.g. after a write that makes the cached data stale.
+    pub fn clear(&self) {
+        self.entries.lock().unwrap().clear();
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn returns_fresh_entries() {
+        let cache: TtlCache<String, u32> = TtlCache::new(Duration::from_secs(60));
+        cache.insert("a".into(), 1);
+        assert_eq!(cache.get("a").as_deref(), Some(&1));
+        assert!(cache.get("b").is_none());
+    }
+
+    #[test]
+    fn drops_expired_entries() {
+        let cache: TtlCache<(), u32> = TtlCache::new(Duration::ZERO);
+        cache.insert((), 1);
+        assert!(cache.get(&()).is_none());
+    }
+
+    #[test]
+    fn removes_expired_entries() {
+        let cache: TtlCache<String, u32> = TtlCache::new(Duration::ZERO);
+        cache.insert("a".into(), 1);
+        cache.insert("b".into(), 2);
+        assert_eq!(cache.entries.lock().unwrap().len(), 1);
+        assert!(cache.get("b").is_none());
+        assert!(cache.entries.lock().unwrap().is_empty());
+    }
+
+    #[test]
+    fn clear_drops_everything() {
+        let cache: TtlCache<String, u32> = TtlCache::new(Duration::from_secs(60));
+        cache.insert("a".into(), 1);
+        cache.clear();
+        assert!(cache.get("a").is_none());
+    }
+}